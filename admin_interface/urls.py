@@ -13,9 +13,12 @@ urlpatterns = [
     path('assigned_users/', AssignedUsersView.as_view(), name='assigned_users'),
     
     path('manage_tasks/', ManageTasksView.as_view(), name='manage_tasks'),
+    path('manage_tasks/data/', ManageTasksDataView.as_view(), name='manage_tasks_data'),
     path('add_task/', AddTaskView.as_view(), name='add_task'),
     path('update_task/', UpdateTaskView.as_view(), name='update_task'),
     path('delete_task/', DeleteTaskView.as_view(), name='delete_task'),
+    path('search_tasks/', SearchTasksView.as_view(), name='search_tasks'),
     
     path('task_reports/', TaskReportsView.as_view(), name='task_reports'),
+    path('task_reports/export/', ExportTaskReportsView.as_view(), name='export_task_reports'),
 ]
@@ -1,12 +1,62 @@
 from django.contrib.auth import authenticate, login, logout
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.db import transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
 from django.views import View
 from django.views.generic import TemplateView
 from admin_interface.permissions_mixin import RoleRequiredMixin
 from apis.constants import *
-from apis.models import Task, User
+from apis.hashing import hash_pool_saturated
+from apis.models import ArchivedTask, Task, User
+from apis.pagination import KeysetPaginator, InvalidCursor
+from apis.routing import ReplicaReadMixin
+from apis.search import search_tasks
+from apis.services import StatusChangeError, VersionConflict, clean_status_change, delete_tasks, save_task, update_task
 from datetime import datetime
+from itertools import chain, islice
+import csv
+import json
+
+
+def tasks_for(user):
+    tasks = Task.objects.select_related("assigned_to__assigned_admin").all()
+    
+    if user.is_admin():
+        tasks = tasks.filter(owner_admin=user)
+    
+    return tasks
+
+
+def archived_tasks_for(user):
+    tasks = ArchivedTask.objects.select_related("assigned_to__assigned_admin").all()
+    
+    if user.is_admin():
+        tasks = tasks.filter(owner_admin=user)
+    
+    return tasks
+
+
+def paginate_users(request, users):
+    """
+    Filters `users` by the `q` search parameter and returns the requested
+    page with the assigned admin and task counters loaded alongside each user.
+    """
+    search = request.GET.get("q", "").strip()
+    if search:
+        users = users.filter(
+            Q(first_name__icontains=search) | Q(last_name__icontains=search) | Q(email__icontains=search)
+        )
+
+    users = users.select_related("assigned_admin", "task_counter").order_by("id")
+
+    return Paginator(users, USER_PAGE_SIZE).get_page(request.GET.get("page")), search
 
 
 # Admin Login
@@ -22,6 +72,12 @@ class AdminLoginView(TemplateView):
             return self.get(request, *args, **kwargs)
         
         user = authenticate(request, username=username, password=password)
+        if hash_pool_saturated(request):
+            messages.error(request, 'Too many logins in progress, please retry')
+            response = self.get(request, *args, **kwargs)
+            response.status_code = 503
+            response["Retry-After"] = "1"
+            return response
         
         if user and user.is_authenticated:
             login(request, user)
@@ -53,11 +109,13 @@ class ManageUsersView(RoleRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        all_users = User.objects.exclude(is_superuser=True, id=self.request.user.id)
+        page_obj, search = paginate_users(self.request, User.objects.exclude(is_superuser=True, id=self.request.user.id))
         admin_users = User.objects.filter(role=ADMIN)
         user_role_choices = [(USER, 'User'), (ADMIN, 'Admin')]
 
-        context['all_users'] = all_users
+        context['all_users'] = page_obj
+        context['page_obj'] = page_obj
+        context['search'] = search
         context['choices'] = user_role_choices
         context['admin_users'] = admin_users
         
@@ -148,10 +206,14 @@ class UpdateUserView(RoleRequiredMixin, View):
         else:
             user.assigned_admin = None
             
-        if previous_role == ADMIN and role != ADMIN:
-            User.objects.filter(assigned_admin=user).update(assigned_admin=None)
-        
-        user.save()
+        with transaction.atomic():
+            if previous_role == ADMIN and role != ADMIN:
+                User.objects.filter(assigned_admin=user).update(assigned_admin=None)
+                Task.objects.filter(owner_admin=user).update(owner_admin=None)
+                ArchivedTask.objects.filter(owner_admin=user).update(owner_admin=None)
+            
+            # Saving copies a changed assigned admin to the user's tasks
+            user.save()
         messages.success(request, f"User updated successfully")
         return redirect("manage_users")
     
@@ -173,6 +235,7 @@ class DeleteUserView(RoleRequiredMixin, View):
             messages.error(request, "User not found")
             return redirect("manage_users")
         
+        # The user's tasks and task counter row are removed by the same cascade
         user.delete()
         messages.success(request, f"User deleted successfully")
         return redirect("manage_users")
@@ -185,35 +248,104 @@ class AssignedUsersView(RoleRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        assigned_users = User.objects.filter(assigned_admin=self.request.user)
+        page_obj, search = paginate_users(self.request, User.objects.filter(assigned_admin=self.request.user))
         
-        context['assigned_users'] = assigned_users
+        context['assigned_users'] = page_obj
+        context['page_obj'] = page_obj
+        context['search'] = search
         return context
     
     
 # Manage Tasks
-class ManageTasksView(RoleRequiredMixin, TemplateView):
+class ManageTasksView(RoleRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "manage_tasks.html"
     allowed_roles = [SUPER_ADMIN, ADMIN]
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
+        # Tasks are loaded page by page from ManageTasksDataView
         users = User.objects.filter(role=USER)
-        tasks = Task.objects.select_related("assigned_to__assigned_admin").all()
-        
         if self.request.user.is_admin():
             users = users.filter(assigned_admin=self.request.user)
-            tasks = tasks.filter(assigned_to__in=users)
-            
         
-        context['tasks'] = tasks
         context['users'] = users
         context['task_status'] = [(STATUS_PENDING, 'Pending'), (STATUS_IN_PROGRESS, 'In Progress'), (STATUS_COMPLETED, 'Completed')]
         
         return context
     
     
+# Manage Tasks Data
+class ManageTasksDataView(RoleRequiredMixin, ReplicaReadMixin, View):
+    allowed_roles = [SUPER_ADMIN, ADMIN]
+    max_page_size = 100
+    # DataTables column index -> sortable field
+    order_columns = {0: "id", 1: "title", 2: "assigned_to__email", 3: "due_date", 4: "status"}
+    
+    def get(self, request, *args, **kwargs):
+        params = request.GET
+        tasks = tasks_for(request.user)
+        records_total = tasks.count()
+        
+        filtered = tasks
+        task_status = params.get("status")
+        if task_status:
+            filtered = filtered.filter(status=task_status)
+        
+        search = params.get("search[value]", params.get("search", "")).strip()
+        if search:
+            filtered = filtered.filter(Q(title__icontains=search) | Q(assigned_to__email__icontains=search))
+        
+        records_filtered = filtered.count() if filtered is not tasks else records_total
+        
+        try:
+            draw = int(params.get("draw", 0))
+            length = int(params.get("length", 10))
+            start = max(int(params.get("start", 0)), 0)
+            order_column = int(params.get("order[0][column]", 0))
+        except ValueError:
+            return JsonResponse({"error": "draw, start, length and order must be integers"}, status=400)
+        if length <= 0 or length > self.max_page_size:
+            length = self.max_page_size
+        
+        response_context = {
+            "draw": draw,
+            "recordsTotal": records_total,
+            "recordsFiltered": records_filtered,
+        }
+        
+        cursor = params.get("cursor")
+        if cursor is not None:
+            # Keyset paging for API style clients, newest first
+            try:
+                page, response_context["next"], response_context["prev"] = KeysetPaginator(filtered, length).paginate(cursor)
+            except InvalidCursor as e:
+                return JsonResponse({"error": str(e)}, status=400)
+        else:
+            order_field = self.order_columns.get(order_column, "id")
+            if params.get("order[0][dir]") == "desc":
+                order_field = f"-{order_field}"
+            page = filtered.order_by(order_field, "id")[start:start + length]
+        
+        response_context["data"] = [self.get_row(task) for task in page]
+        return JsonResponse(response_context)
+    
+    def get_row(self, task):
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "assigned_to": task.assigned_to_id,
+            "assigned_to_email": task.assigned_to.email,
+            "due_date": task.due_date.isoformat(),
+            "status": task.status,
+            "status_display": task.get_status_display(),
+            "completion_report": task.completion_report or "",
+            "worked_hours": str(task.worked_hours) if task.worked_hours is not None else "",
+            "version": task.version,
+        }
+    
+    
 # Add Task
 class AddTaskView(RoleRequiredMixin, View):
     allowed_roles = [SUPER_ADMIN, ADMIN]
@@ -229,7 +361,12 @@ class AddTaskView(RoleRequiredMixin, View):
             messages.error(request, "Fill all the required fields")
             return redirect("manage_tasks")
         
-        if Task.objects.filter(title__iexact=title).exists():
+        # Archived tasks keep their titles too. Compared through Lower() so the
+        # checks can use the task_title_lower_idx and archived_title_lower_idx indexes
+        if any(
+            tasks.alias(title_lower=Lower('title')).filter(title_lower=Lower(Value(title))).exists()
+            for tasks in (Task.objects, ArchivedTask.objects)
+        ):
             messages.error(request, "Task with this title already exists. Please use a different title")
             return redirect("manage_tasks")
         
@@ -237,8 +374,13 @@ class AddTaskView(RoleRequiredMixin, View):
             messages.error(request, "Due date cannot be in the past")
             return redirect("manage_tasks")
         
-        Task.objects.create(title=title, description=description,
-            assigned_to_id=assigned_to, due_date=due_date, status=status)
+        try:
+            assigned_to_user = User.objects.get(id=assigned_to)
+        except User.DoesNotExist:
+            messages.error(request, "Assigning user not found")
+            return redirect("manage_tasks")
+        
+        save_task(Task(title=title, description=description, assigned_to=assigned_to_user, due_date=due_date, status=status))
         
         messages.success(request, f"Task created successfully")
         return redirect("manage_tasks")
@@ -260,12 +402,6 @@ class UpdateTaskView(RoleRequiredMixin, View):
             messages.error(request, "Fill all the required fields")
             return redirect("manage_tasks")
         
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
-            messages.error(request, "Task not found")
-            return redirect("manage_tasks")
-        
         try:
             assigned_to_user = User.objects.get(id=assigned_to)
         except User.DoesNotExist:
@@ -276,40 +412,34 @@ class UpdateTaskView(RoleRequiredMixin, View):
             messages.error(request, "Due date cannot be in the past")
             return redirect("manage_tasks")
         
-        if task.status == STATUS_COMPLETED and status != STATUS_COMPLETED:
-            messages.error(request, "A completed task cannot be reverted to previous status")
+        try:
+            values = clean_status_change(status, request.POST.get("completion_report"), request.POST.get("worked_hours"))
+        except StatusChangeError as e:
+            messages.error(request, str(e))
             return redirect("manage_tasks")
-                
-        if status == STATUS_COMPLETED:
-            completion_report = request.POST.get("completion_report", "").strip()
-            worked_hours = request.POST.get("worked_hours")
-
-            if not completion_report or not worked_hours:
-                messages.error(request, "Completion report and worked hours are required when marking task as completed")
-                return redirect("manage_tasks")
-
-            try:
-                worked_hours_val = float(worked_hours)
-            except ValueError:
-                messages.error(request, "Worked hours must be a valid number")
-                return redirect("manage_tasks")
-
-            if worked_hours_val <= 0:
-                messages.error(request, "Worked hours must be greater than 0")
-                return redirect("manage_tasks")
-
-            task.completion_report = completion_report
-            task.worked_hours = worked_hours_val
-        else:
-            task.completion_report = None
-            task.worked_hours = None
         
-        task.title = title
-        task.description = description
-        task.assigned_to = assigned_to_user
-        task.due_date = due_date
-        task.status = status
-        task.save()
+        # The version the edit form was opened with, so changes made meanwhile are not overwritten
+        version = request.POST.get("version")
+        try:
+            expected_version = int(version) if version else None
+        except ValueError:
+            messages.error(request, "Invalid task version")
+            return redirect("manage_tasks")
+        
+        try:
+            update_task(task_id, {
+                **values, "title": title, "description": description, "due_date": due_date,
+                "assigned_to_id": assigned_to_user.id, "owner_admin_id": assigned_to_user.assigned_admin_id,
+            }, expected_version=expected_version)
+        except Task.DoesNotExist:
+            messages.error(request, "Task not found")
+            return redirect("manage_tasks")
+        except StatusChangeError as e:
+            messages.error(request, str(e))
+            return redirect("manage_tasks")
+        except VersionConflict:
+            messages.error(request, "Task was changed by someone else while you were editing it. Please try again")
+            return redirect("manage_tasks")
         
         messages.success(request, f"Task updated successfully")
         return redirect("manage_tasks")
@@ -332,25 +462,108 @@ class DeleteTaskView(RoleRequiredMixin, View):
             messages.error(request, "Task not found")
             return redirect("manage_tasks")
         
-        task.delete()
+        delete_tasks([task])
         messages.success(request, f"Task deleted successfully")
         return redirect("manage_tasks")
         
     
-# Task Reports
-class TaskReportsView(RoleRequiredMixin, TemplateView):
-    template_name = "task_reports.html"
+# Search Tasks
+class SearchTasksView(RoleRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "search_tasks.html"
     allowed_roles = [SUPER_ADMIN, ADMIN]
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        search = self.request.GET.get("q", "").strip()
+        tasks = search_tasks(tasks_for(self.request.user), search) if search else Task.objects.none()
+        page_obj = Paginator(tasks, SEARCH_PAGE_SIZE).get_page(self.request.GET.get("page"))
         
-        users = User.objects.filter(role=USER)
-        tasks = Task.objects.select_related("assigned_to__assigned_admin").filter(status=STATUS_COMPLETED).all()
-        
-        if self.request.user.is_admin():
-            users = users.filter(assigned_admin=self.request.user)
-            tasks = tasks.filter(assigned_to__in=users)
+        context['tasks'] = page_obj
+        context['page_obj'] = page_obj
+        context['search'] = search
+        return context
         
-        context['tasks'] = tasks.order_by('-updated_at') 
-        return context
\ No newline at end of file
+    
+def completed_tasks_for(user):
+    """
+    The live and the archived completed tasks, newest first within each.
+    Archived tasks are older than the live ones once the archive command ran.
+    """
+    return [
+        tasks_for(user).filter(status=STATUS_COMPLETED).order_by('-updated_at'),
+        archived_tasks_for(user).order_by('-updated_at'),
+    ]
+
+
+# Task Reports
+class TaskReportsView(RoleRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "task_reports.html"
+    allowed_roles = [SUPER_ADMIN, ADMIN]
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tasks'] = chain(*completed_tasks_for(self.request.user))
+        return context
+    
+    
+class Echo:
+    """File-like object for csv.writer that hands each row back instead of storing it."""
+    
+    def write(self, value):
+        return value
+    
+    
+async def stream_in_batches(chunks, batch_size):
+    """
+    Serves a sync iterator of chunks that reads the database to an async
+    server. Django would otherwise read all of it into memory first. Each
+    batch is read in one hop to the sync thread, the one the iterator's
+    cursor belongs to, and sent as one chunk.
+    """
+    chunks = iter(chunks)
+    next_batch = sync_to_async(lambda: "".join(islice(chunks, batch_size)))
+    while batch := await next_batch():
+        yield batch
+    
+    
+# Export Task Reports
+class ExportTaskReportsView(RoleRequiredMixin, View):
+    allowed_roles = [SUPER_ADMIN, ADMIN]
+    chunk_size = 2000
+    columns = ["id", "title", "assigned_user", "assigned_admin", "due_date", "completed_at", "worked_hours", "completion_report"]
+    
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in ("csv", "ndjson"):
+            messages.error(request, "Export format must be csv or ndjson")
+            return redirect("task_reports")
+        
+        tasks = chain.from_iterable(tasks.iterator(chunk_size=self.chunk_size) for tasks in completed_tasks_for(request.user))
+        
+        if export_format == "csv":
+            writer = csv.writer(Echo())
+            rows = chain([writer.writerow(self.columns)], (writer.writerow(self.get_row(task).values()) for task in tasks))
+            content_type = "text/csv"
+        else:
+            rows = (json.dumps(self.get_row(task), cls=DjangoJSONEncoder) + "\n" for task in tasks)
+            content_type = "application/x-ndjson"
+        
+        # Under ASGI a sync iterator would be buffered whole before sending
+        if isinstance(request, ASGIRequest):
+            rows = stream_in_batches(rows, self.chunk_size)
+        response = StreamingHttpResponse(rows, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="task_reports.{export_format}"'
+        return response
+    
+    def get_row(self, task):
+        admin = task.assigned_to.assigned_admin
+        return {
+            "id": task.id,
+            "title": task.title,
+            "assigned_user": task.assigned_to.email,
+            "assigned_admin": admin.email if admin else "",
+            "due_date": task.due_date.isoformat(),
+            "completed_at": task.completed_at.isoformat(),
+            "worked_hours": task.worked_hours,
+            "completion_report": task.completion_report,
+        }
\ No newline at end of file
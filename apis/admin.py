@@ -1,6 +1,8 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import User, Task
+from .services import StatusChangeError, check_status_transition, clean_status_change, delete_tasks, save_task
 
 class UserAdmin(BaseUserAdmin):
     model = User
@@ -25,5 +27,45 @@ class UserAdmin(BaseUserAdmin):
     ordering = ('email',)
     filter_horizontal = ('groups', 'user_permissions',)
 
+
+class TaskAdminForm(forms.ModelForm):
+    class Meta:
+        model = Task
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        try:
+            values = clean_status_change(
+                cleaned_data.get('status'), cleaned_data.get('completion_report'), cleaned_data.get('worked_hours')
+            )
+            if self.instance.pk:
+                check_status_transition(self.instance.status, values['status'])
+        except StatusChangeError as e:
+            raise forms.ValidationError(str(e))
+        cleaned_data.update(values)
+        return cleaned_data
+
+
+class TaskAdmin(admin.ModelAdmin):
+    form = TaskAdminForm
+
+    list_display = ('title', 'assigned_to', 'owner_admin', 'status', 'due_date', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('title',)
+    # Kept up to date by the task writes
+    readonly_fields = ('owner_admin', 'version', 'completed_at', 'created_at', 'updated_at')
+
+    # Saved and deleted like the admin panel does, so counters, rollups and tombstones follow
+    def save_model(self, request, obj, form, change):
+        save_task(obj)
+
+    def delete_model(self, request, obj):
+        delete_tasks([obj])
+
+    def delete_queryset(self, request, queryset):
+        delete_tasks(queryset)
+
+
 admin.site.register(User, UserAdmin)
-admin.site.register(Task)
+admin.site.register(Task, TaskAdmin)
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apis'
+
+    def ready(self):
+        from apis import signals  # noqa: F401
+
+        prune_interval = getattr(settings, "TOKEN_BLACKLIST_PRUNE_INTERVAL", None)
+        if prune_interval:
+            from apis.token_blacklist import start_background_pruner
+            start_background_pruner(prune_interval, getattr(settings, "TOKEN_BLACKLIST_PRUNE_BATCH_SIZE", 1000))
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from apis.authentication import ClaimsJWTAuthentication
+from apis.conditional import version_etag, parse_if_match_version
+from apis.hashing import password_hash_pool, HashPoolSaturated
+from apis.models import Task, User
+from apis.routing import read_from_replica
+from apis.services import clean_status_change, update_task_status, StatusChangeError, VersionConflict
+from apis.task_cache import task_fragment_cache, splice_json
+from apis.views import GetTasksView, RequestError, TaskReportView, login_tokens
+
+# CPU bound work (password hashing, serialization) runs on this pool instead
+# of the event loop
+cpu_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ASYNC_CPU_WORKERS", None) or os.cpu_count(),
+    thread_name_prefix="async-cpu",
+)
+
+# Synchronous Django code (ORM queries, transactions) runs on this pool of
+# ASYNC_SYNC_CONCURRENCY threads. sync_to_async would otherwise run it all on
+# one shared thread, one request at a time
+sync_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ASYNC_SYNC_CONCURRENCY", 16),
+    thread_name_prefix="async-sync",
+)
+
+
+def call_with_connection(func, *args, **kwargs):
+    # The pool's threads outlive requests, so their connections are recycled
+    # around each call the way Django does around a request, by CONN_MAX_AGE
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    return await sync_to_async(call_with_connection, thread_sensitive=False, executor=sync_executor)(func, *args, **kwargs)
+
+
+async def run_cpu(func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, partial(func, *args, **kwargs))
+
+
+class AsyncAPIView(View):
+    """
+    Base for the async API views: JSON request bodies, JWT authentication
+    with ClaimsJWTAuthentication, and no CSRF check, like DRF's APIView.
+    """
+    authenticator = ClaimsJWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def json_response(self, data, status=200):
+        return JsonResponse(data, status=status, encoder=DjangoJSONEncoder)
+
+    def get_data(self, request):
+        if request.content_type == "application/json":
+            try:
+                return json.loads(request.body or b"{}")
+            except ValueError:
+                raise ValueError("Request body is not valid JSON")
+        return request.POST
+
+    async def authenticate(self, request):
+        """Sets request.user from the bearer token, returns an error response when it is missing or invalid."""
+        try:
+            result = await run_sync(self.authenticator.authenticate, request)
+        except AuthenticationFailed as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+            response = self.json_response(detail, status=401)
+        else:
+            if result is not None:
+                request.user, request.auth = result
+                return None
+            response = self.json_response({"detail": "Authentication credentials were not provided."}, status=401)
+        response["WWW-Authenticate"] = self.authenticator.authenticate_header(request)
+        return response
+
+
+# Async Login API
+class AsyncLoginView(AsyncAPIView):
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            try:
+                data = self.get_data(request)
+            except ValueError as e:
+                return self.json_response({"error": str(e)}, status=400)
+
+            email = data.get("email")
+            password = data.get("password")
+            if not all([email, password]):
+                return self.json_response({"error": "Email and password are required."}, status=400)
+
+            user = await run_sync(User.objects.get, email=email)
+            if not user.is_active:
+                return self.json_response({"error": "Account is not active, please contact admin"}, status=400)
+
+            # On the password hash pool when it is enabled, otherwise on the CPU pool
+            try:
+                valid, needs_upgrade = await password_hash_pool.averify(password, user.password, cpu_executor)
+                if not valid:
+                    return self.json_response({"error": "Invalid credentials"}, status=401)
+                if needs_upgrade:
+                    # What check_password's setter does, with the hashing kept off the event loop
+                    user.password = await password_hash_pool.amake(password, cpu_executor)
+                    await run_sync(user.save, update_fields=["password"])
+            except HashPoolSaturated as e:
+                response = self.json_response({"error": str(e)}, status=503)
+                response["Retry-After"] = "1"
+                return response
+
+            # Issuing the refresh token records it for the blacklist
+            tokens = await run_sync(login_tokens, user)
+            return self.json_response({"message": "Login successful", "data": tokens})
+        except User.DoesNotExist:
+            return self.json_response({"error": "No account found in this email"}, status=400)
+        except Exception as e:
+            return self.json_response({"error": str(e)}, status=500)
+
+
+# Async Get Tasks API
+class AsyncGetTasksView(AsyncAPIView):
+    """GET api/v1/tasks/ with the same parameters, validators, cache and response."""
+
+    def list_view(self, request):
+        # Parameter handling and rendering are shared with the sync view
+        view = GetTasksView()
+        view.request = Request(request)
+        # Set explicitly, otherwise DRF would authenticate again without authenticators
+        view.request.user = request.user
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        error = await self.authenticate(request)
+        if error is not None:
+            return error
+
+        # The database steps run in one sync call, the rendering on the CPU pool
+        view = self.list_view(request)
+        try:
+            result = await run_sync(self.read_list, view)
+        except RequestError as e:
+            return self.json_response({"error": str(e)}, status=e.status_code)
+        if isinstance(result, HttpResponse):
+            return result
+
+        tasks, values_serializer, response_context, validators = result
+        body = splice_json(response_context, "data", await run_cpu(view.render_tasks, tasks, values_serializer))
+        return await run_sync(view.list_response, body, validators)
+
+    def read_list(self, view):
+        read_from_replica(view.request.user)
+        return view.read_list(view.request)
+
+
+# Async Update Task Status API
+class AsyncUpdateTaskStatusView(AsyncAPIView):
+
+    async def put(self, request, *args, **kwargs):
+        try:
+            error = await self.authenticate(request)
+            if error is not None:
+                return error
+            if not request.user.is_user():
+                return self.json_response({"error": "You are not a user"}, status=403)
+
+            task_id = kwargs.get("id")
+            try:
+                data = self.get_data(request)
+                values = clean_status_change(data.get("status"), data.get("completion_report"), data.get("worked_hours"))
+                expected_version = parse_if_match_version(request)
+            except (StatusChangeError, ValueError) as e:
+                return self.json_response({"error": str(e)}, status=400)
+
+            try:
+                # A transaction with on_commit hooks, so it stays synchronous
+                version = await run_sync(
+                    update_task_status, task_id, values, assigned_to_id=request.user.id, expected_version=expected_version
+                )
+            except StatusChangeError as e:
+                return self.json_response({"error": str(e)}, status=400)
+            except VersionConflict as e:
+                if expected_version is not None:
+                    return self.json_response({"error": str(e)}, status=412)
+                return self.json_response({"error": f"{e}, please retry"}, status=409)
+
+            response = self.json_response({"message": "Task status updated successfully", "data": {"id": task_id, "version": version}})
+            response["ETag"] = version_etag(version)
+            return response
+        except Task.DoesNotExist:
+            return self.json_response({"error": "No task found with this ID"}, status=400)
+        except Exception as e:
+            return self.json_response({"error": str(e)}, status=500)
+
+
+# Async Task Report API
+class AsyncTaskReportView(AsyncAPIView):
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            error = await self.authenticate(request)
+            if error is not None:
+                return error
+
+            view = TaskReportView()
+            try:
+                task = await run_sync(self.read_report, view, request, kwargs.get("id"))
+            except RequestError as e:
+                return self.json_response({"error": str(e)}, status=e.status_code)
+            if isinstance(task, HttpResponse):
+                return task
+
+            fragment = (await run_cpu(task_fragment_cache.render_many, [task]))[0]
+            return view.report_response(task, fragment)
+        except Exception as e:
+            return self.json_response({"error": str(e)}, status=500)
+
+    def read_report(self, view, request, task_id):
+        read_from_replica(request.user)
+        return view.read_report(request, task_id)
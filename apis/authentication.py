@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.functional import cached_property
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from apis.constants import ADMIN, SUPER_ADMIN, USER
+from apis.models import User
+
+
+class UserStatusCache:
+    """
+    Small in-process LRU cache of (is_active, role) per user id. Entries expire
+    after `ttl` seconds, which bounds how stale another process can be after
+    a user is updated, since invalidation only reaches the current process.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, status = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return status
+
+    def set(self, user_id, status):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, status)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_status_cache = UserStatusCache(
+    maxsize=getattr(settings, "USER_STATUS_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "USER_STATUS_CACHE_TTL", 60),
+)
+
+
+def get_user_status(user_id):
+    status = user_status_cache.get(user_id)
+    if status is None:
+        status = User.objects.filter(id=user_id).values_list("is_active", "role").first()
+        if status is None:
+            return None
+        user_status_cache.set(user_id, status)
+    return status
+
+
+def invalidate_user_status(user_id):
+    user_status_cache.invalidate(user_id)
+
+
+class ClaimsUser(TokenUser):
+    """Request user built from the token claims instead of a database row."""
+
+    def __init__(self, token, role):
+        super().__init__(token)
+        self.role = role
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    def is_superadmin(self):
+        return self.role == SUPER_ADMIN
+
+    def is_admin(self):
+        return self.role == ADMIN
+
+    def is_user(self):
+        return self.role == USER
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips loading the User row. Whether the user is
+    still active, and their current role, come from the user status cache so
+    deactivations and role changes apply without waiting for token expiry.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        status = get_user_status(user_id)
+        if status is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        is_active, role = status
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return ClaimsUser(validated_token, role)
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = ClaimsJWTAuthentication
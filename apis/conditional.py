@@ -0,0 +1,72 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag
+from apis.models import TaskTombstone, User
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest())
+
+
+def task_list_validators(request, queryset):
+    """
+    Validators for a list of the requesting user's tasks, computed with
+    aggregate queries. Removed tasks only leave a tombstone behind, so the
+    latest tombstone counts as a modification too, and every task embeds the
+    user, so a change to the user does as well. The query string is part of
+    the ETag because filters and cursors change the representation.
+    """
+    stats = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("id"))
+    last_deleted = TaskTombstone.objects.filter(user_id=request.user.id).aggregate(last_deleted=Max("deleted_at"))["last_deleted"]
+    user_updated = User.objects.filter(id=request.user.id).values_list("updated_at", flat=True).first()
+    last_modified = max(filter(None, [stats["last_modified"], last_deleted, user_updated]), default=None)
+    etag = make_etag(
+        request.user.id, stats["count"], last_modified and last_modified.isoformat(),
+        user_updated and user_updated.isoformat(), request.get_full_path(),
+    )
+    return etag, last_modified
+
+
+def task_validators(task):
+    last_modified = max(task.updated_at, task.assigned_to.updated_at)
+    etag = make_etag(task.id, task.updated_at.isoformat(), task.assigned_to.updated_at.isoformat())
+    return etag, last_modified
+
+
+def not_modified_response(request, etag, last_modified):
+    """Returns a 304 response when the request's preconditions match, otherwise None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def version_etag(version):
+    return quote_etag(str(version))
+
+
+def parse_if_match_version(request):
+    """
+    Returns the task version sent in If-Match, or None when the header is
+    missing or "*". Raises ValueError when it is not a single version tag.
+    """
+    value = request.headers.get("If-Match", "").strip()
+    if not value or value == "*":
+        return None
+    etags = parse_etags(value)
+    if len(etags) != 1:
+        raise ValueError("If-Match must contain a single task version")
+    tag = etags[0].removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise ValueError("If-Match must contain a single task version")
+    return int(tag)
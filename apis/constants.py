@@ -4,4 +4,24 @@ USER = 'user'
 
 STATUS_PENDING = 'pending'
 STATUS_IN_PROGRESS = 'in_progress'
-STATUS_COMPLETED = 'completed'
\ No newline at end of file
+STATUS_COMPLETED = 'completed'
+
+TASK_PAGE_SIZE = 50
+TASK_MAX_PAGE_SIZE = 200
+
+USER_PAGE_SIZE = 25
+
+BULK_STATUS_MAX_ITEMS = 100
+
+DAILY_REPORT_DEFAULT_DAYS = 30
+DAILY_REPORT_MAX_DAYS = 366
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 1000
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+SYNC_WATERMARK_LAG_SECONDS = 60
+TOMBSTONE_RETENTION_DAYS = 30
+TOMBSTONE_PRUNE_BATCH_SIZE = 1000
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from apis.constants import STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED
+from apis.models import ArchivedTask, DailyCompletionRollup, Task, UserTaskCounter
+
+COUNTER_FIELDS = {
+    STATUS_PENDING: 'pending',
+    STATUS_IN_PROGRESS: 'in_progress',
+    STATUS_COMPLETED: 'completed',
+}
+
+
+def task_state(task):
+    """
+    The part of a task the counters and rollups depend on. Take it before and
+    after a write and pass both to `apply_task_changes`.
+    """
+    if task is None:
+        return None
+    worked_hours = Decimal(str(task.worked_hours)) if task.worked_hours is not None else Decimal(0)
+    # Bucketed on completed_at, so editing a completed task does not move it to another day
+    completed_on = timezone.localdate(task.completed_at) if task.status == STATUS_COMPLETED else None
+    return int(task.assigned_to_id), task.status, worked_hours, completed_on
+
+
+def apply_task_changes(changes):
+    """
+    Applies (before, after) task states to the counters and the daily
+    completion rollups with one F() update per affected row. `before` is None
+    for a created task and `after` is None for a deleted one. Must run in the
+    transaction that wrote the tasks.
+    """
+    counter_deltas = defaultdict(lambda: defaultdict(int))
+    rollup_deltas = defaultdict(lambda: defaultdict(int))
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            user_id, task_status, worked_hours, completed_on = state
+            counter_deltas[user_id][COUNTER_FIELDS[task_status]] += sign
+            counter_deltas[user_id]['worked_hours'] += sign * worked_hours
+            if completed_on is not None:
+                rollup_deltas[(user_id, completed_on)]['completed'] += sign
+                rollup_deltas[(user_id, completed_on)]['worked_hours'] += sign * worked_hours
+
+    for user_id, fields in counter_deltas.items():
+        fields = {name: value for name, value in fields.items() if value}
+        if not fields:
+            continue
+        updated = UserTaskCounter.objects.filter(user_id=user_id).update(
+            **{name: F(name) + value for name, value in fields.items()}
+        )
+        if not updated:
+            # No counter row yet, the tasks written in this transaction are already visible to the rebuild
+            rebuild_task_counters([user_id])
+
+    for (user_id, day), fields in rollup_deltas.items():
+        fields = {name: value for name, value in fields.items() if value}
+        if not fields:
+            continue
+        updated = DailyCompletionRollup.objects.filter(user_id=user_id, day=day).update(
+            **{name: F(name) + value for name, value in fields.items()}
+        )
+        if not updated:
+            rebuild_completion_rollups([user_id], day, day)
+        elif fields.get('completed', 0) < 0:
+            DailyCompletionRollup.objects.filter(user_id=user_id, day=day, completed=0).delete()
+
+
+def rebuild_task_counters(user_ids):
+    """
+    Recomputes the counters of `user_ids` from the task table and rewrites the
+    rows that drifted. Returns the number of rows created or repaired.
+    """
+    user_ids = list(user_ids)
+
+    with transaction.atomic():
+        counters = UserTaskCounter.objects.select_for_update().in_bulk(user_ids)
+        totals = {
+            row['assigned_to_id']: row
+            for row in Task.objects.filter(assigned_to_id__in=user_ids).values('assigned_to_id').annotate(
+                pending=Count('id', filter=Q(status=STATUS_PENDING)),
+                in_progress=Count('id', filter=Q(status=STATUS_IN_PROGRESS)),
+                completed=Count('id', filter=Q(status=STATUS_COMPLETED)),
+                worked_hours=Sum('worked_hours'),
+            ).order_by()
+        }
+        # Archived tasks are all completed and still count
+        archived = {
+            row['assigned_to_id']: row
+            for row in ArchivedTask.objects.filter(assigned_to_id__in=user_ids).values('assigned_to_id').annotate(
+                completed=Count('id'),
+                worked_hours=Sum('worked_hours'),
+            ).order_by()
+        }
+
+        created, repaired = [], []
+        for user_id in user_ids:
+            row = totals.get(user_id, {})
+            archived_row = archived.get(user_id, {})
+            values = {
+                'pending': row.get('pending', 0),
+                'in_progress': row.get('in_progress', 0),
+                'completed': row.get('completed', 0) + archived_row.get('completed', 0),
+                'worked_hours': (row.get('worked_hours') or Decimal(0)) + (archived_row.get('worked_hours') or Decimal(0)),
+            }
+            counter = counters.get(user_id)
+            if counter is None:
+                if any(values.values()):
+                    created.append(UserTaskCounter(user_id=user_id, **values))
+            elif any(getattr(counter, name) != value for name, value in values.items()):
+                for name, value in values.items():
+                    setattr(counter, name, value)
+                repaired.append(counter)
+
+        UserTaskCounter.objects.bulk_create(created)
+        UserTaskCounter.objects.bulk_update(repaired, list(COUNTER_FIELDS.values()) + ['worked_hours'])
+
+    return len(created) + len(repaired)
+
+
+def rebuild_completion_rollups(user_ids, date_from=None, date_to=None):
+    """
+    Replaces the daily completion rollups of `user_ids` between `date_from`
+    and `date_to` (inclusive, open ended when None) with totals computed from
+    the live and archived tasks. Returns the number of rollup rows written.
+    """
+    user_ids = list(user_ids)
+    tz = timezone.get_current_timezone()
+    tiers = [
+        Task.objects.filter(assigned_to_id__in=user_ids, status=STATUS_COMPLETED),
+        ArchivedTask.objects.filter(assigned_to_id__in=user_ids),
+    ]
+    rollups = DailyCompletionRollup.objects.filter(user_id__in=user_ids)
+    if date_from:
+        start = timezone.make_aware(datetime.combine(date_from, time.min), tz)
+        tiers = [tasks.filter(completed_at__gte=start) for tasks in tiers]
+        rollups = rollups.filter(day__gte=date_from)
+    if date_to:
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min), tz)
+        tiers = [tasks.filter(completed_at__lt=end) for tasks in tiers]
+        rollups = rollups.filter(day__lte=date_to)
+
+    with transaction.atomic():
+        rollups.delete()
+        totals = defaultdict(lambda: {'completed': 0, 'worked_hours': Decimal(0)})
+        for tasks in tiers:
+            for row in tasks.annotate(day=TruncDate('completed_at', tzinfo=tz)).values('assigned_to_id', 'day').annotate(
+                completed=Count('id'),
+                worked_hours=Sum('worked_hours'),
+            ).order_by():
+                total = totals[(row['assigned_to_id'], row['day'])]
+                total['completed'] += row['completed']
+                total['worked_hours'] += row['worked_hours'] or Decimal(0)
+        rows = [
+            DailyCompletionRollup(user_id=user_id, day=day, **total)
+            for (user_id, day), total in totals.items()
+        ]
+        DailyCompletionRollup.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
@@ -0,0 +1,27 @@
+import os
+import time
+from django.contrib.auth.hashers import check_password, get_hashers, make_password
+
+# Runs in the password hash pool's worker processes. Kept apart from
+# apis.hashing, which imports the auth models, so unpickling these in a
+# freshly spawned process does not need the app registry.
+
+
+def start_worker(settings_module):
+    # The hashers only read settings, so the apps (and their ready() hooks,
+    # e.g. the token blacklist pruner) are not set up in the workers
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    get_hashers()
+
+
+def verify(password, encoded, submitted_at):
+    started_at = time.monotonic()
+    upgraded = []
+    valid = check_password(password, encoded, setter=upgraded.append)
+    return valid, bool(upgraded), started_at - submitted_at, time.monotonic() - started_at
+
+
+def make(password, submitted_at):
+    started_at = time.monotonic()
+    encoded = make_password(password)
+    return encoded, started_at - submitted_at, time.monotonic() - started_at
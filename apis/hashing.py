@@ -0,0 +1,201 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from apis import hash_workers
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class HashMetrics:
+    """Hash latency and queue wait over the last `window` hashes of this process."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._hash_seconds = deque(maxlen=window)
+        self._wait_seconds = deque(maxlen=window)
+        self.hashes = 0
+        self.rejected = 0
+
+    def record(self, wait, duration):
+        with self._lock:
+            self.hashes += 1
+            self._wait_seconds.append(wait)
+            self._hash_seconds.append(duration)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def summary(self, samples):
+        samples = sorted(samples)
+        if not samples:
+            return None
+        return {
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p95_ms": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+    def stats(self):
+        with self._lock:
+            hash_seconds, wait_seconds = list(self._hash_seconds), list(self._wait_seconds)
+            hashes, rejected = self.hashes, self.rejected
+        return {
+            "hashes": hashes,
+            "rejected": rejected,
+            "hash_latency": self.summary(hash_seconds),
+            "queue_wait": self.summary(wait_seconds),
+        }
+
+
+class PasswordHashPool:
+    """
+    Runs password hashing on a pool of `workers` processes, so a burst of
+    logins uses those cores instead of the request threads' CPU time. At most
+    `max_queue` hashes wait for a free process, past that `verify` and `make`
+    raise HashPoolSaturated right away instead of queueing. When disabled the
+    hashing runs inline, with the same metrics.
+    """
+
+    def __init__(self, enabled, workers, max_queue):
+        self.enabled = enabled
+        self.workers = workers or os.cpu_count()
+        self.max_queue = max_queue
+        self.metrics = HashMetrics()
+        self._executor = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawned rather than forked, forking a threaded server process can copy held locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=hash_workers.start_worker,
+                    initargs=(settings.SETTINGS_MODULE,),
+                )
+            return self._executor
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.metrics.reject()
+                raise HashPoolSaturated("Too many logins in progress, please retry")
+            self._in_flight += 1
+        try:
+            future = self.executor.submit(func, *args, time.monotonic())
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def verify(self, password, encoded):
+        """Returns whether `password` matches `encoded`, and whether the hash should be upgraded."""
+        if not self.enabled:
+            valid, upgrade, wait, duration = hash_workers.verify(password, encoded, time.monotonic())
+        else:
+            valid, upgrade, wait, duration = self.submit(hash_workers.verify, password, encoded).result()
+        self.metrics.record(wait, duration)
+        return valid, upgrade
+
+    async def averify(self, password, encoded, executor=None):
+        """verify() for async code, which runs it on `executor` when the pool is disabled."""
+        if not self.enabled:
+            return await asyncio.get_running_loop().run_in_executor(executor, self.verify, password, encoded)
+        valid, upgrade, wait, duration = await asyncio.wrap_future(self.submit(hash_workers.verify, password, encoded))
+        self.metrics.record(wait, duration)
+        return valid, upgrade
+
+    def make(self, password):
+        if not self.enabled:
+            encoded, wait, duration = hash_workers.make(password, time.monotonic())
+        else:
+            encoded, wait, duration = self.submit(hash_workers.make, password).result()
+        self.metrics.record(wait, duration)
+        return encoded
+
+    async def amake(self, password, executor=None):
+        if not self.enabled:
+            return await asyncio.get_running_loop().run_in_executor(executor, self.make, password)
+        encoded, wait, duration = await asyncio.wrap_future(self.submit(hash_workers.make, password))
+        self.metrics.record(wait, duration)
+        return encoded
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers if self.enabled else None,
+            "max_queue": self.max_queue if self.enabled else None,
+            "in_flight": self._in_flight,
+            **self.metrics.stats(),
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    enabled=getattr(settings, "PASSWORD_HASH_POOL", False),
+    workers=getattr(settings, "PASSWORD_HASH_WORKERS", None),
+    max_queue=getattr(settings, "PASSWORD_HASH_MAX_QUEUE", 32),
+)
+
+
+def check_user_password(user, password):
+    """user.check_password() on the hash pool, upgrading the stored hash like Django does."""
+    valid, upgrade = password_hash_pool.verify(password, user.password)
+    if valid and upgrade:
+        user.password = password_hash_pool.make(password)
+        user.save(update_fields=["password"])
+    return valid
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend with the password check on the hash pool. When the pool is
+    full the login fails with PermissionDenied, the only error authenticate()
+    handles, so every login form (the Django admin's included) treats it as
+    a failed login. The request is flagged, see hash_pool_saturated().
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            try:
+                user = UserModel._default_manager.get_by_natural_key(username)
+            except UserModel.DoesNotExist:
+                # Hash anyway, so a missing account takes as long as a wrong password
+                password_hash_pool.make(password)
+                return None
+            valid = check_user_password(user, password)
+        except HashPoolSaturated as e:
+            if request is not None:
+                request.password_hash_pool_saturated = True
+            raise PermissionDenied(str(e))
+        if valid and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+def hash_pool_saturated(request):
+    """Whether authenticate() failed for this request because the hash pool was full."""
+    return getattr(request, "password_hash_pool_saturated", False)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from apis.constants import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, STATUS_COMPLETED
+from apis.models import ArchivedTask, Task, TaskTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves tasks completed more than --days ago from the task table into the archive, "
+        "one batch per transaction. Counters and daily rollups keep counting archived tasks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the tasks that would be archived")
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] <= 0:
+            raise CommandError("--days must not be negative and --batch-size must be positive")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        tasks = Task.objects.filter(status=STATUS_COMPLETED, completed_at__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{tasks.count()} tasks would be archived")
+            return
+
+        archived = 0
+        while True:
+            moved = self.archive_batch(tasks, options["batch_size"])
+            if not moved:
+                break
+            archived += moved
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} tasks completed before {cutoff:%Y-%m-%d}"))
+
+    def archive_batch(self, tasks, batch_size):
+        with transaction.atomic():
+            # Oldest first along the (status, completed_at) index
+            batch = list(tasks.select_for_update().order_by("completed_at", "id")[:batch_size])
+            if not batch:
+                return 0
+            ArchivedTask.objects.bulk_create([ArchivedTask.from_task(task) for task in batch])
+            # Synced clients drop the tasks like any other removal
+            TaskTombstone.objects.bulk_create(
+                [TaskTombstone(task_id=task.id, user_id=task.assigned_to_id) for task in batch]
+            )
+            # Deleting through the queryset sends post_delete, which invalidates the cached task lists
+            Task.objects.filter(id__in=[task.id for task in batch]).delete()
+        return len(batch)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from apis.counters import rebuild_completion_rollups
+from apis.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily completion rollups from completed tasks, one batch of users per transaction"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--from", dest="date_from", help="First day to rebuild (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="date_to", help="Last day to rebuild (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        date_from = self.parse_day(options["date_from"], "--from")
+        date_to = self.parse_day(options["date_to"], "--to")
+        batch_size = options["batch_size"]
+        written = 0
+        last_id = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            written += rebuild_completion_rollups(user_ids, date_from, date_to)
+            last_id = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily completion rollups"))
+
+    def parse_day(self, value, name):
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"{name} must be a valid date (YYYY-MM-DD)")
+        return day
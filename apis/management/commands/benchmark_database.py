@@ -0,0 +1,128 @@
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from apis.constants import STATUS_IN_PROGRESS, STATUS_PENDING, USER
+from apis.models import Task, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a mixed read/write load against a temporary SQLite database with the default "
+        "settings and with the production profile (DB_PROFILE=production) and compares throughput"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--write-ratio", type=float, default=0.2)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--tasks", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        profiles = [
+            ("default", {}),
+            ("production", settings.SQLITE_PRODUCTION_SETTINGS),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in profiles:
+                alias = f"benchmark_{name}"
+                database = {"ENGINE": "django.db.backends.sqlite3", "NAME": f"{directory}/{name}.sqlite3", **profile}
+                connections.settings[alias] = connections.configure_settings(
+                    {DEFAULT_DB_ALIAS: settings.DATABASES[DEFAULT_DB_ALIAS], alias: database}
+                )[alias]
+                try:
+                    self.populate(alias, options["users"], options["tasks"])
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute("PRAGMA journal_mode")
+                        journal_mode = cursor.fetchone()[0]
+                    result = self.run_load(alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+                self.report(f"{name} (journal_mode={journal_mode})", result, options["seconds"])
+
+    def populate(self, alias, user_count, task_count):
+        call_command("migrate", database=alias, verbosity=0)
+        User.objects.using(alias).bulk_create(
+            [User(email=f"benchmark{i}@example.com", first_name="Benchmark", role=USER) for i in range(user_count)]
+        )
+        user_ids = list(User.objects.using(alias).values_list("id", flat=True))
+        Task.objects.using(alias).bulk_create(
+            [
+                Task(title=f"Task {i}", description="Benchmark task", assigned_to_id=random.choice(user_ids), due_date=date(2030, 1, 1))
+                for i in range(task_count)
+            ],
+            batch_size=1000,
+        )
+        connections[alias].close()
+
+    def run_load(self, alias, options):
+        user_ids = list(User.objects.using(alias).values_list("id", flat=True))
+        task_ids = list(Task.objects.using(alias).values_list("id", flat=True))
+        connections[alias].close()
+
+        result = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["seconds"]
+
+        def worker():
+            reads = writes = errors = 0
+            latencies = []
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    if random.random() < options["write_ratio"]:
+                        self.write(alias, random.choice(task_ids))
+                        writes += 1
+                    else:
+                        self.read(alias, random.choice(user_ids))
+                        reads += 1
+                    latencies.append(time.perf_counter() - start)
+                except OperationalError:
+                    errors += 1
+                finally:
+                    # What request_finished does at the end of every request
+                    connections[alias].close_if_unusable_or_obsolete()
+            connections[alias].close()
+            with lock:
+                result["reads"] += reads
+                result["writes"] += writes
+                result["errors"] += errors
+                result["latencies"].extend(latencies)
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return result
+
+    def read(self, alias, user_id):
+        list(Task.objects.using(alias).filter(assigned_to_id=user_id).order_by("-updated_at")[:50])
+
+    def write(self, alias, task_id):
+        # Read then write in one transaction, the same shape as a task status update
+        with transaction.atomic(using=alias):
+            current = Task.objects.using(alias).filter(id=task_id).values("status", "version").get()
+            new_status = STATUS_IN_PROGRESS if current["status"] == STATUS_PENDING else STATUS_PENDING
+            Task.objects.using(alias).filter(id=task_id, version=current["version"]).update(
+                status=new_status, updated_at=timezone.now(), version=F("version") + 1
+            )
+
+    def report(self, name, result, seconds):
+        operations = result["reads"] + result["writes"]
+        latencies = sorted(result["latencies"])
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+        self.stdout.write(
+            f"{name}: {operations / seconds:,.0f} ops/sec "
+            f"({result['reads'] / seconds:,.0f} reads/sec, {result['writes'] / seconds:,.0f} writes/sec), "
+            f"{result['errors']} errors, p95 {p95:.1f} ms"
+        )
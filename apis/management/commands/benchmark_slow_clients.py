@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a running server with clients whose requests are slow on the server side (logins, which hash "
+        "the password with PBKDF2) next to normal clients listing their tasks, and reports the normal clients' "
+        "throughput and latency. Pass one --target per API, served by the same ASGI server, e.g. "
+        "--target sync=http://127.0.0.1:8001/api/v1/ --target async=http://127.0.0.1:8001/api/v1/async/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", required=True, help="name=API base URL")
+        parser.add_argument("--email", required=True, help="A user with at least one task")
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--slow-clients", type=int, default=20)
+        parser.add_argument("--clients", type=int, default=10)
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, _, url = target.partition("=")
+            if not url:
+                raise CommandError("--target must look like name=http://host:port/api/v1/")
+            targets.append((name, url if url.endswith("/") else url + "/"))
+
+        for name, url in targets:
+            result = asyncio.run(self.run_target(url, options))
+            self.report(name, result, options["seconds"])
+
+    async def run_target(self, url, options):
+        parts = urlsplit(url)
+        server = (parts.hostname, parts.port or 80)
+        prefix = parts.path
+
+        login = json.dumps({"email": options["email"], "password": options["password"]}).encode()
+        status, body = await self.request(server, "POST", f"{prefix}Login/", body=login, timeout=options["timeout"])
+        if status != 200:
+            raise CommandError(f"Login to {url} failed with {status}: {body[:200]!r}")
+        headers = {"Authorization": f"Bearer {json.loads(body)['data']['access_token']}"}
+
+        status, body = await self.request(server, "GET", f"{prefix}tasks/?page_size=1", headers=headers, timeout=options["timeout"])
+        tasks = json.loads(body)["data"] if status == 200 else []
+        if not tasks:
+            raise CommandError(f"{options['email']} has no tasks on {url}")
+
+        result = {"latencies": [], "errors": 0, "slow_requests": 0, "slow_errors": 0}
+        deadline = time.monotonic() + options["seconds"]
+
+        async def client():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    status, _ = await self.request(server, "GET", f"{prefix}tasks/", headers=headers, timeout=options["timeout"])
+                except (OSError, asyncio.TimeoutError):
+                    status = None
+                if status == 200:
+                    result["latencies"].append(time.perf_counter() - start)
+                else:
+                    result["errors"] += 1
+
+        async def slow_client():
+            while time.monotonic() < deadline:
+                try:
+                    status, _ = await self.request(server, "POST", f"{prefix}Login/", body=login, timeout=options["timeout"])
+                except (OSError, asyncio.TimeoutError):
+                    status = None
+                if status == 200:
+                    result["slow_requests"] += 1
+                else:
+                    result["slow_errors"] += 1
+
+        await asyncio.gather(
+            *(slow_client() for _ in range(options["slow_clients"])),
+            *(client() for _ in range(options["clients"])),
+        )
+        return result
+
+    async def request(self, server, method, path, headers=None, body=b"", timeout=30):
+        return await asyncio.wait_for(self.send(server, method, path, headers or {}, body), timeout)
+
+    async def send(self, server, method, path, headers, body):
+        reader, writer = await asyncio.open_connection(*server)
+        try:
+            head = [f"{method} {path} HTTP/1.1", f"Host: {server[0]}:{server[1]}", "Connection: close"]
+            if body:
+                head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+            head += [f"{name}: {value}" for name, value in headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            response = await reader.read()
+            return status, response.partition(b"\r\n\r\n")[2]
+        finally:
+            writer.close()
+
+    def report(self, name, result, seconds):
+        latencies = sorted(result["latencies"])
+
+        def percentile(p):
+            return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0
+
+        self.stdout.write(
+            f"{name}: {len(latencies) / seconds:,.1f} req/sec, p50 {percentile(0.5):.0f} ms, p99 {percentile(0.99):.0f} ms, "
+            f"{result['errors']} errors; slow clients completed {result['slow_requests']} logins, {result['slow_errors']} failed"
+        )
@@ -0,0 +1,51 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apis.constants import USER
+from apis.models import Task, User
+from apis.serializers import TaskSerializer, TaskValuesSerializer
+from apis.task_cache import task_fragment_cache
+
+
+class Command(BaseCommand):
+    help = "Compares rows/sec of TaskSerializer, TaskValuesSerializer and cached task fragments. Sample data is rolled back afterwards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--fields", default="id,title,assigned_to_id,due_date,status,worked_hours,version,created_at,updated_at")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        fields = TaskValuesSerializer.parse_fields(options["fields"])
+
+        with transaction.atomic():
+            user = User.objects.create_user(email="benchmark@example.com", first_name="Benchmark", role=USER)
+            Task.objects.bulk_create(
+                [
+                    Task(title=f"Task {i}", description="Benchmark task " * 10, assigned_to=user, due_date=date(2030, 1, 1))
+                    for i in range(rows)
+                ],
+                batch_size=1000,
+            )
+            tasks = Task.objects.filter(assigned_to=user)
+
+            cases = [
+                ("TaskSerializer", lambda: TaskSerializer(tasks.select_related("assigned_to"), many=True).data),
+                ("TaskValuesSerializer (all fields)", lambda: TaskValuesSerializer(TaskValuesSerializer.FIELDS).serialize(tasks.values(*TaskValuesSerializer.FIELDS))),
+                (f"TaskValuesSerializer ({','.join(fields)})", lambda: TaskValuesSerializer(fields).serialize(tasks.values(*fields))),
+            ]
+            if task_fragment_cache.enabled:
+                # The first run fills the cache, the best of the repeats is a fully warm cache
+                cases.append(("TaskFragmentCache (warm)", lambda: task_fragment_cache.render_many(tasks.select_related("assigned_to"))))
+            for name, run in cases:
+                best = min(self.timed(run) for _ in range(options["repeat"]))
+                self.stdout.write(f"{name}: {rows / best:,.0f} rows/sec ({best * 1000:.1f} ms for {rows} rows)")
+
+            transaction.set_rollback(True)
+
+    def timed(self, run):
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from apis.constants import TOMBSTONE_PRUNE_BATCH_SIZE, TOMBSTONE_RETENTION_DAYS
+from apis.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        f"Deletes task tombstones older than {TOMBSTONE_RETENTION_DAYS} days in bounded batches. "
+        "Sync watermarks older than that are rejected, so clients sync again from scratch"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=TOMBSTONE_PRUNE_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive")
+
+        removed = prune_tombstones(batch_size=options["batch_size"], max_batches=options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} task tombstones"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from apis.token_blacklist import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Deletes expired outstanding and blacklisted refresh tokens in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        removed = prune_expired_tokens(batch_size=options["batch_size"], max_batches=options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} expired tokens"))
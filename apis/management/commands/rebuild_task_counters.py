@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from apis.counters import rebuild_task_counters
+from apis.models import User
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-user task counters from the task table and repairs any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        repaired = 0
+        last_id = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            repaired += rebuild_task_counters(user_ids)
+            last_id = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} task counters"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from apis.search import rebuild_task_search, search_supported
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreates the task search table and triggers if they are missing and reindexes every task (SQLite only). "
+        "migrate already does this when a migration rebuilt the task table and dropped the triggers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if not search_supported(connection):
+            raise CommandError("The task search index is only used on SQLite")
+
+        rebuild_task_search(connection)
+        self.stdout.write(self.style.SUCCESS("Rebuilt the task search index"))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tombstones', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'deleted_at'], name='tombstone_user_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:54
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0002_tasktombstone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', 'updated_at'], name='task_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='task_title_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_counters(apps, schema_editor):
+    Task = apps.get_model('apis', 'Task')
+    UserTaskCounter = apps.get_model('apis', 'UserTaskCounter')
+    db_alias = schema_editor.connection.alias
+    rows = Task.objects.using(db_alias).values('assigned_to_id').annotate(
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        completed=Count('id', filter=Q(status='completed')),
+        worked_hours=Sum('worked_hours'),
+    ).order_by()
+    UserTaskCounter.objects.using(db_alias).bulk_create(
+        [
+            UserTaskCounter(
+                user_id=row['assigned_to_id'], pending=row['pending'], in_progress=row['in_progress'],
+                completed=row['completed'], worked_hours=row['worked_hours'] or 0,
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('worked_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0004_usertaskcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCompletionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('worked_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completion_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='rollup_user_day_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_owner_admin(apps, schema_editor):
+    Task = apps.get_model('apis', 'Task')
+    User = apps.get_model('apis', 'User')
+    Task.objects.using(schema_editor.connection.alias).update(
+        owner_admin_id=Subquery(User.objects.filter(id=OuterRef('assigned_to_id')).values('assigned_admin_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0005_dailycompletionrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='owner_admin',
+            field=models.ForeignKey(blank=True, limit_choices_to={'role': 'admin'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='owned_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner_admin', 'status', 'updated_at'], name='task_owner_status_idx'),
+        ),
+        migrations.RunPython(populate_owner_admin, migrations.RunPython.noop),
+    ]
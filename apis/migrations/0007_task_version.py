@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0006_task_owner_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0007_task_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('due_date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed')], default='completed', max_length=20)),
+                ('completion_report', models.TextField(blank=True, null=True)),
+                ('worked_hours', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('assigned_to', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+                ('owner_admin', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='owned_archived_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['assigned_to', 'updated_at'], name='archived_assignee_updated_idx'), models.Index(fields=['owner_admin', 'updated_at'], name='archived_owner_updated_idx'), models.Index(fields=['updated_at'], name='archived_updated_idx')],
+            },
+        ),
+    ]
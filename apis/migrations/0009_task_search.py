@@ -0,0 +1,60 @@
+from django.db import migrations
+
+
+class SQLiteRunSQL(migrations.RunSQL):
+    """RunSQL that only runs on SQLite, FTS5 is SQLite only and other databases search with LIKE."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "sqlite":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "sqlite":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0008_archivedtask'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(
+            sql=[
+                """
+                CREATE VIRTUAL TABLE apis_task_fts USING fts5(
+                    title, description, completion_report,
+                    content='apis_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                )
+                """,
+                """
+                CREATE TRIGGER apis_task_fts_insert AFTER INSERT ON apis_task BEGIN
+                    INSERT INTO apis_task_fts(rowid, title, description, completion_report)
+                    VALUES (new.id, new.title, new.description, new.completion_report);
+                END
+                """,
+                """
+                CREATE TRIGGER apis_task_fts_delete AFTER DELETE ON apis_task BEGIN
+                    INSERT INTO apis_task_fts(apis_task_fts, rowid, title, description, completion_report)
+                    VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+                END
+                """,
+                """
+                CREATE TRIGGER apis_task_fts_update AFTER UPDATE OF title, description, completion_report ON apis_task BEGIN
+                    INSERT INTO apis_task_fts(apis_task_fts, rowid, title, description, completion_report)
+                    VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+                    INSERT INTO apis_task_fts(rowid, title, description, completion_report)
+                    VALUES (new.id, new.title, new.description, new.completion_report);
+                END
+                """,
+                "INSERT INTO apis_task_fts(apis_task_fts) VALUES ('rebuild')",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS apis_task_fts_insert",
+                "DROP TRIGGER IF EXISTS apis_task_fts_delete",
+                "DROP TRIGGER IF EXISTS apis_task_fts_update",
+                "DROP TABLE IF EXISTS apis_task_fts",
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:34
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def populate_completed_at(apps, schema_editor):
+    # The completion time was not stored before, the last update is the closest record of it
+    Task = apps.get_model('apis', 'Task')
+    ArchivedTask = apps.get_model('apis', 'ArchivedTask')
+    alias = schema_editor.connection.alias
+    Task.objects.using(alias).filter(status='completed').update(completed_at=F('updated_at'))
+    ArchivedTask.objects.using(alias).update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0009_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['completed_at'], name='archived_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'completed_at'], name='task_status_completed_idx'),
+        ),
+        migrations.RunPython(populate_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0010_task_completed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner_admin', 'updated_at', 'id'], name='task_owner_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0011_task_owner_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:44
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0012_tasktombstone_deleted_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='archived_title_lower_idx'),
+        ),
+    ]
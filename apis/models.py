@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser,BaseUserManager, PermissionsMixin
 from apis.constants import ADMIN, SUPER_ADMIN, USER, STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED
 from django.utils.translation import gettext_lazy as _
@@ -70,6 +72,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'role']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a change of admin can be copied to the user's tasks
+        instance._loaded_assigned_admin_id = instance.__dict__.get('assigned_admin_id')
+        return instance
+
     def __str__(self):
         return self.email
     
@@ -103,13 +112,147 @@ class Task(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks', limit_choices_to={'role': USER})
+    # Copy of assigned_to.assigned_admin so admin scoped queries do not need to join through the user
+    owner_admin = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='owned_tasks', limit_choices_to={'role': ADMIN})
     due_date = models.DateField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
     completion_report = models.TextField(blank=True, null=True)
     worked_hours = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    # Incremented by every update, used for optimistic concurrency (If-Match)
+    version = models.PositiveIntegerField(default=1)
+    # Set when the task moves to completed, later edits leave it alone
+    completed_at = models.DateTimeField(blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_to', 'status', 'updated_at'], name='task_assignee_status_idx'),
+            models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+            models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+            models.Index(fields=['status', 'completed_at'], name='task_status_completed_idx'),
+            models.Index(fields=['owner_admin', 'status', 'updated_at'], name='task_owner_status_idx'),
+            models.Index(fields=['owner_admin', 'updated_at', 'id'], name='task_owner_updated_idx'),
+            models.Index(Lower('title'), name='task_title_lower_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a reassignment can invalidate the previous assignee's cached task list
+        instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id')
+        return instance
+
+    def completed_at_after(self, task_status, now):
+        """The completed_at value once this task is moved to `task_status` at `now`."""
+        if task_status != STATUS_COMPLETED:
+            return None
+        return self.completed_at if self.status == STATUS_COMPLETED and self.completed_at else now
+
+    def save(self, *args, **kwargs):
+        # owner_admin is a copy of the assignee's admin, never set on its own
+        if Task.assigned_to.is_cached(self):
+            self.owner_admin_id = self.assigned_to.assigned_admin_id
+        else:
+            self.owner_admin_id = User.objects.filter(id=self.assigned_to_id).values_list('assigned_admin_id', flat=True).first()
+        # Writers that know the previous status use completed_at_after(), this covers plain saves
+        if self.status != STATUS_COMPLETED:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} - {self.status}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Completed tasks moved out of Task by the archive_completed_tasks command.
+    Keeps the task's id and timestamps, so reports read both tables alike.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tasks')
+    owner_admin = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='owned_archived_tasks')
+    due_date = models.DateField()
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, default=STATUS_COMPLETED)
+    completion_report = models.TextField(blank=True, null=True)
+    worked_hours = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    version = models.PositiveIntegerField(default=1)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    COPIED_FIELDS = [
+        'id', 'title', 'description', 'assigned_to_id', 'owner_admin_id', 'due_date', 'status',
+        'completion_report', 'worked_hours', 'version', 'completed_at', 'created_at', 'updated_at',
+    ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_to', 'updated_at'], name='archived_assignee_updated_idx'),
+            models.Index(fields=['owner_admin', 'updated_at'], name='archived_owner_updated_idx'),
+            models.Index(fields=['updated_at'], name='archived_updated_idx'),
+            models.Index(fields=['completed_at'], name='archived_completed_idx'),
+            models.Index(Lower('title'), name='archived_title_lower_idx'),
+        ]
+
+    @classmethod
+    def from_task(cls, task):
+        return cls(**{name: getattr(task, name) for name in cls.COPIED_FIELDS})
+
+    def __str__(self):
+        return f"{self.title} - archived"
+
+
+class TaskTombstone(models.Model):
+    task_id = models.BigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_tombstones')
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='tombstone_user_deleted_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} removed from {self.user_id}"
+
+
+class UserTaskCounter(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='task_counter')
+    pending = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    @property
+    def total(self):
+        return self.pending + self.in_progress + self.completed
+
+    def __str__(self):
+        return f"Task counters for {self.user_id}"
+
+
+class DailyCompletionRollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='completion_rollups')
+    day = models.DateField()
+    completed = models.PositiveIntegerField(default=0)
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='rollup_user_day_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='rollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} completed {self.completed} on {self.day}"
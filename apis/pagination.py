@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(updated_at, pk, reverse=False):
+    payload = json.dumps({"u": updated_at.isoformat(), "i": pk, "r": reverse}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        updated_at = parse_datetime(payload["u"])
+        pk = int(payload["i"])
+        reverse = bool(payload.get("r", False))
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursor("Invalid cursor")
+
+    if updated_at is None:
+        raise InvalidCursor("Invalid cursor")
+    return updated_at, pk, reverse
+
+
+def row_key(row):
+    if isinstance(row, dict):
+        return row["updated_at"], row["id"]
+    return row.updated_at, row.id
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset on (updated_at, id), newest first. Every page is a
+    range scan starting at the cursor, so its cost does not depend on how
+    deep into the history the client is. Works with model instances and
+    values() rows.
+    """
+
+    def __init__(self, queryset, page_size):
+        self.queryset = queryset
+        self.page_size = page_size
+
+    def paginate(self, cursor=None):
+        queryset, reverse = self.page_queryset(cursor)
+        return self.finish_page(list(queryset[:self.page_size + 1]), cursor, reverse)
+
+    def page_queryset(self, cursor):
+        queryset = self.queryset
+        reverse = False
+
+        if cursor:
+            updated_at, pk, reverse = decode_cursor(cursor)
+            # The redundant bound on updated_at alone lets the database use it as an index range
+            if reverse:
+                queryset = queryset.filter(updated_at__gte=updated_at).filter(Q(updated_at__gt=updated_at) | Q(id__gt=pk))
+            else:
+                queryset = queryset.filter(updated_at__lte=updated_at).filter(Q(updated_at__lt=updated_at) | Q(id__lt=pk))
+
+        if reverse:
+            queryset = queryset.order_by('updated_at', 'id')
+        else:
+            queryset = queryset.order_by('-updated_at', '-id')
+        return queryset, reverse
+
+    def finish_page(self, rows, cursor, reverse):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, bool(cursor)
+
+        next_cursor = prev_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(*row_key(rows[-1]))
+        if rows and has_prev:
+            prev_cursor = encode_cursor(*row_key(rows[0]), reverse=True)
+
+        return rows, next_cursor, prev_cursor
@@ -0,0 +1,139 @@
+import random
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+_request_state = ContextVar("database_routing_state", default=None)
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def pin_cache():
+    return caches[getattr(settings, "REPLICA_PIN_CACHE_ALIAS", "default")]
+
+
+def pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_ids):
+    """Sends reads for `user_ids` to the primary for REPLICA_PIN_SECONDS, while the replicas catch up."""
+    seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+    if replica_aliases() and seconds:
+        pin_cache().set_many({pin_key(user_id): True for user_id in user_ids}, timeout=seconds)
+
+
+def is_pinned(user_id):
+    return pin_cache().get(pin_key(user_id)) is not None
+
+
+def read_from_replica(user):
+    """Lets the rest of the current request read from a replica, unless `user` was pinned to the primary."""
+    state = _request_state.get()
+    if state is None or not replica_aliases() or not user.is_authenticated:
+        return
+    if not is_pinned(user.id):
+        state.use_replica = True
+
+
+class ReplicaRouter:
+    """
+    Routes reads to a random replica in DATABASE_REPLICAS when the view
+    asked for it (see ReplicaReadMixin), everything else to the primary.
+    Once the request writes anything its remaining reads go to the primary
+    too, so it always sees its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return random.choice(replica_aliases())
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary
+        databases = {"default", *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks database routing per request and pins users who wrote to the
+    primary for REPLICA_PIN_SECONDS, so their next requests read their own
+    writes even if the replicas lag behind. Supports sync and async requests,
+    so async views keep running on the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        state = RoutingState()
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote:
+            self.pin_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote:
+            await sync_to_async(self.pin_writer)(request)
+        return response
+
+    def pin_writer(self, request):
+        # DRF sets request.user on the underlying request once it authenticated the token
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary([user.id])
+
+
+class ReplicaReadMixin:
+    """For read only Django views, sends their queries to a replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        read_from_replica(request.user)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaReadAPIMixin:
+    """For read only DRF views, sends their queries to a replica once the token is authenticated."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        read_from_replica(request.user)
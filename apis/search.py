@@ -0,0 +1,122 @@
+import re
+from django.db import connections
+from django.db.models import Q
+
+TASK_SEARCH_TABLE = "apis_task_fts"
+TASK_SEARCH_COLUMNS = "title, description, completion_report"
+
+# An external content FTS5 table over apis_task, kept in sync by triggers.
+# The update trigger only fires when an indexed column is written, so status
+# and version updates leave the index alone.
+CREATE_TASK_SEARCH_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_SEARCH_TABLE} USING fts5(
+        {TASK_SEARCH_COLUMNS},
+        content='apis_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_insert AFTER INSERT ON apis_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE}(rowid, {TASK_SEARCH_COLUMNS})
+        VALUES (new.id, new.title, new.description, new.completion_report);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_delete AFTER DELETE ON apis_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}, rowid, {TASK_SEARCH_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_update AFTER UPDATE OF {TASK_SEARCH_COLUMNS} ON apis_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}, rowid, {TASK_SEARCH_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+        INSERT INTO {TASK_SEARCH_TABLE}(rowid, {TASK_SEARCH_COLUMNS})
+        VALUES (new.id, new.title, new.description, new.completion_report);
+    END
+    """,
+]
+
+DROP_TASK_SEARCH_SQL = [
+    f"DROP TRIGGER IF EXISTS {TASK_SEARCH_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {TASK_SEARCH_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {TASK_SEARCH_TABLE}_update",
+    f"DROP TABLE IF EXISTS {TASK_SEARCH_TABLE}",
+]
+
+# bm25 column weights, a match in the title counts most
+RANK_SQL = f"bm25({TASK_SEARCH_TABLE}, 10.0, 1.0, 2.0)"
+
+
+def search_supported(connection):
+    return connection.vendor == "sqlite"
+
+
+def install_task_search(connection):
+    """Creates the search table and its triggers where missing, without indexing existing tasks."""
+    with connection.cursor() as cursor:
+        for sql in CREATE_TASK_SEARCH_SQL:
+            cursor.execute(sql)
+
+
+def uninstall_task_search(connection):
+    with connection.cursor() as cursor:
+        for sql in DROP_TASK_SEARCH_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_task_search(connection):
+    """Reindexes every task, e.g. after tasks were written with the triggers missing."""
+    install_task_search(connection)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}) VALUES ('optimize')")
+
+
+def repair_task_search(connection):
+    """
+    Recreates missing triggers and reindexes every task when the search table
+    exists but lost its triggers, which happens when a migration remakes
+    apis_task on SQLite. Returns whether a repair was needed.
+    """
+    triggers = {f"{TASK_SEARCH_TABLE}_insert", f"{TASK_SEARCH_TABLE}_delete", f"{TASK_SEARCH_TABLE}_update"}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)", [TASK_SEARCH_TABLE, *triggers])
+        names = {row[0] for row in cursor.fetchall()}
+    if TASK_SEARCH_TABLE not in names or triggers <= names:
+        return False
+    rebuild_task_search(connection)
+    return True
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query)
+
+
+def search_tasks(queryset, query):
+    """
+    Narrows a Task queryset to the tasks matching every word of `query` (as a
+    prefix, in the title, description or completion report), best match
+    first. The full text index picks the matching rows, so the cost follows
+    the number of matches, not the size of the task table. Other databases
+    fall back to a substring search, newest first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if not search_supported(connections[queryset.db]):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(completion_report__icontains=term)
+            )
+        return queryset.order_by("-updated_at", "-id")
+
+    # Quoted, so words are never read as FTS5 operators
+    match = " ".join(f'"{term}"*' for term in terms)
+    return queryset.extra(
+        select={"rank": RANK_SQL},
+        tables=[TASK_SEARCH_TABLE],
+        where=[f"{TASK_SEARCH_TABLE}.rowid = apis_task.id", f"{TASK_SEARCH_TABLE} MATCH %s"],
+        params=[match],
+    ).order_by("rank", "-id")
@@ -1,5 +1,9 @@
+from decimal import Decimal
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from apis.models import Task, User
+from apis.token_blacklist import FilteredRefreshToken
 
 
 class LoginSerializer(serializers.Serializer):
@@ -7,6 +11,10 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField()
     
     
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
+    
+    
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -18,11 +26,88 @@ class TaskSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Task
-        fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at']
+        exclude = ['owner_admin']
+        read_only_fields = ['version', 'created_at', 'updated_at']
         
         
+class TaskValuesSerializer:
+    """
+    Read-only serializer for Task.objects.values() rows. Columns are rendered
+    the same way TaskSerializer renders them, without DRF's per-field
+    machinery, and callers can ask for a subset of the fields.
+    """
+    FIELDS = [
+        'id', 'title', 'description', 'assigned_to_id', 'due_date', 'status',
+        'completion_report', 'worked_hours', 'version', 'created_at', 'updated_at',
+    ]
+
+    def __init__(self, fields=None):
+        self.fields = list(fields or self.FIELDS)
+        self.timezone = timezone.get_current_timezone()
+        self.converters = {
+            'due_date': self.format_date,
+            'worked_hours': self.format_decimal,
+            'created_at': self.format_datetime,
+            'updated_at': self.format_datetime,
+        }
+
+    @classmethod
+    def parse_fields(cls, value):
+        fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+        if not fields:
+            raise ValueError("fields must list at least one field")
+
+        unknown = [field for field in fields if field not in cls.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def format_date(self, value):
+        return value.isoformat()
+
+    def format_decimal(self, value):
+        return f"{value.quantize(Decimal('0.01')):f}"
+
+    def format_datetime(self, value):
+        value = value.astimezone(self.timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def to_representation(self, row):
+        data = {}
+        for field in self.fields:
+            value = row[field]
+            converter = self.converters.get(field)
+            data[field] = converter(value) if converter and value is not None else value
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+def sideload_users(rows, key='assigned_to_id'):
+    """
+    Serializes the users referenced by rows once, keyed by id, instead of
+    nesting the same user in every row. Uses one query for the distinct ids.
+    """
+    user_ids = {row[key] for row in rows if row[key] is not None}
+    if not user_ids:
+        return {}
+    users = User.objects.filter(id__in=user_ids)
+    return {str(user.id): UserSerializer(user).data for user in users}
+
+
 class UpdateTaskStatusSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=True)
     completion_report = serializers.CharField(required=False)
-    worked_hours = serializers.IntegerField(required=False)
\ No newline at end of file
+    worked_hours = serializers.IntegerField(required=False)
+
+
+class BulkTaskStatusItemSerializer(UpdateTaskStatusSerializer):
+    id = serializers.IntegerField()
+    version = serializers.IntegerField(required=False)
+
+
+class BulkUpdateTaskStatusSerializer(serializers.Serializer):
+    tasks = BulkTaskStatusItemSerializer(many=True)
@@ -0,0 +1,161 @@
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from apis.constants import STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED
+from apis.counters import apply_task_changes, task_state
+from apis.models import Task, TaskTombstone
+from apis.task_cache import task_list_cache
+
+
+class StatusChangeError(Exception):
+    pass
+
+
+class VersionConflict(Exception):
+    pass
+
+
+STATUS_MAP = {
+    'pending': STATUS_PENDING,
+    'in_progress': STATUS_IN_PROGRESS,
+    'completed': STATUS_COMPLETED,
+}
+
+
+def clean_status_change(task_status, completion_report=None, worked_hours=None):
+    """
+    Validates a requested status change and returns the field values to store
+    on the task. Raises StatusChangeError with a client facing message.
+    """
+    if not task_status:
+        raise StatusChangeError("Status is required")
+
+    status_value = STATUS_MAP.get(str(task_status).lower())
+    if status_value is None:
+        raise StatusChangeError("Invalid status value")
+
+    if status_value != STATUS_COMPLETED:
+        return {"status": status_value, "completion_report": None, "worked_hours": None}
+
+    completion_report = (completion_report or "").strip()
+    if not completion_report or worked_hours is None:
+        raise StatusChangeError("Completion report and worked hours are required when marking task as completed")
+
+    try:
+        worked_hours_val = Decimal(str(worked_hours))
+    except InvalidOperation:
+        raise StatusChangeError("Worked hours must be a valid number")
+
+    if not worked_hours_val.is_finite():
+        raise StatusChangeError("Worked hours must be a valid number")
+
+    # Rounded the way the column stores it, so the counters add what is stored
+    field = Task._meta.get_field("worked_hours")
+    step = Decimal(1).scaleb(-field.decimal_places)
+    worked_hours_val = worked_hours_val.quantize(step)
+    if worked_hours_val <= 0:
+        raise StatusChangeError("Worked hours must be greater than 0")
+    max_hours = Decimal(10) ** (field.max_digits - field.decimal_places) - step
+    if worked_hours_val > max_hours:
+        raise StatusChangeError(f"Worked hours must be at most {max_hours}")
+
+    return {"status": status_value, "completion_report": completion_report, "worked_hours": worked_hours_val}
+
+
+def check_status_transition(current_status, new_status):
+    if current_status == STATUS_COMPLETED and new_status != STATUS_COMPLETED:
+        raise StatusChangeError("A completed task cannot be reverted to previous status")
+
+
+def update_task_status(task_id, values, assigned_to_id=None, expected_version=None):
+    """
+    Applies values from `clean_status_change` with one conditional UPDATE of
+    the changed columns, see `guarded_update`. Returns the new version.
+    """
+    tasks = Task.objects.filter(id=task_id)
+    if assigned_to_id is not None:
+        tasks = tasks.filter(assigned_to_id=assigned_to_id)
+    return guarded_update(tasks, values, expected_version)
+
+
+def update_task(task_id, values, expected_version=None):
+    """
+    Applies an edit of the whole task (the admin panel's edit form) the same
+    way. `values` holds the edited columns: the status fields from
+    `clean_status_change`, and `assigned_to_id` with the matching
+    `owner_admin_id` when the task is reassigned. Returns the new version.
+    """
+    return guarded_update(Task.objects.filter(id=task_id), values, expected_version)
+
+
+def guarded_update(tasks, values, expected_version=None):
+    """
+    Updates the one task in `tasks` with one conditional UPDATE. The WHERE
+    clause carries the version that was read and, unless the task is being
+    completed, `status != completed`, so a concurrent writer makes the UPDATE
+    match no row instead of being overwritten. The narrow read before it
+    supplies the previous state the counters need. Raises VersionConflict,
+    StatusChangeError, or Task.DoesNotExist. Returns the new version.
+    """
+    with transaction.atomic():
+        current = tasks.values("id", "assigned_to_id", "status", "worked_hours", "completed_at", "updated_at", "version").get()
+        if expected_version is not None and current["version"] != expected_version:
+            raise VersionConflict("Task was modified by another request")
+        check_status_transition(current["status"], values["status"])
+
+        guarded = tasks.filter(version=current["version"])
+        if values["status"] != STATUS_COMPLETED:
+            guarded = guarded.exclude(status=STATUS_COMPLETED)
+
+        now = timezone.now()
+        previous = Task(**current)
+        completed_at = previous.completed_at_after(values["status"], now)
+        if not guarded.update(**values, completed_at=completed_at, updated_at=now, version=F("version") + 1):
+            raise VersionConflict("Task was modified by another request")
+
+        changed = Task(**{**current, **values, "completed_at": completed_at, "updated_at": now})
+        apply_task_changes([(task_state(previous), task_state(changed))])
+        # update() sends no post_save signal
+        task_list_cache.invalidate_on_commit({previous.assigned_to_id, changed.assigned_to_id})
+        record_reassignment(changed.id, previous.assigned_to_id, changed.assigned_to_id)
+
+    return current["version"] + 1
+
+
+def record_reassignment(task_id, previous_assignee_id, assignee_id):
+    if previous_assignee_id != assignee_id:
+        # The previous assignee's clients learn about the removal through sync
+        TaskTombstone.objects.create(task_id=task_id, user_id=previous_assignee_id)
+        TaskTombstone.objects.filter(task_id=task_id, user_id=assignee_id).delete()
+
+
+def save_task(task):
+    """
+    Saves a task created or edited as a whole (the admin panel's add form,
+    the Django admin) and applies what every task write applies: counters
+    and rollups, the completion time, the version, and a tombstone for the
+    previous assignee on reassignment. Raises StatusChangeError when a
+    completed task would be reopened.
+    """
+    with transaction.atomic():
+        previous = Task.objects.select_for_update().filter(id=task.id).first() if task.id else None
+        if previous is not None:
+            check_status_transition(previous.status, task.status)
+            task.completed_at = previous.completed_at_after(task.status, timezone.now())
+            task.version = previous.version + 1
+        task.save()
+        apply_task_changes([(task_state(previous), task_state(task))])
+        if previous is not None:
+            record_reassignment(task.id, previous.assigned_to_id, task.assigned_to_id)
+    return task
+
+
+def delete_tasks(tasks):
+    """Deletes `tasks`, leaving tombstones for synced clients and taking them out of the counters and rollups."""
+    tasks = list(tasks)
+    with transaction.atomic():
+        TaskTombstone.objects.bulk_create([TaskTombstone(task_id=task.id, user_id=task.assigned_to_id) for task in tasks])
+        apply_task_changes([(task_state(task), None) for task in tasks])
+        # Sends post_delete for each task, which invalidates the cached task lists
+        Task.objects.filter(id__in=[task.id for task in tasks]).delete()
@@ -0,0 +1,46 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from apis.authentication import invalidate_user_status
+from apis.models import ArchivedTask, Task, User
+from apis.search import repair_task_search, search_supported
+from apis.task_cache import task_list_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_status(sender, instance, **kwargs):
+    invalidate_user_status(instance.id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_task_lists_for_user(sender, instance, **kwargs):
+    # Task lists embed the assigned user
+    task_list_cache.invalidate_on_commit([instance.id])
+
+
+@receiver(post_save, sender=User)
+def copy_assigned_admin_to_tasks(sender, instance, created, update_fields=None, **kwargs):
+    # Tasks keep a copy of their assignee's admin in owner_admin
+    if created or (update_fields is not None and "assigned_admin" not in update_fields):
+        return
+    if getattr(instance, "_loaded_assigned_admin_id", None) == instance.assigned_admin_id:
+        return
+    Task.objects.filter(assigned_to=instance).update(owner_admin_id=instance.assigned_admin_id)
+    ArchivedTask.objects.filter(assigned_to=instance).update(owner_admin_id=instance.assigned_admin_id)
+    instance._loaded_assigned_admin_id = instance.assigned_admin_id
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_cached_task_lists(sender, instance, **kwargs):
+    # On reassignment both the previous and the new assignee's lists change
+    user_ids = {instance.assigned_to_id, getattr(instance, "_loaded_assigned_to_id", None)}
+    task_list_cache.invalidate_on_commit(user_ids - {None})
+
+
+@receiver(post_migrate)
+def repair_task_search_triggers(sender, using, **kwargs):
+    # A migration that remakes apis_task on SQLite drops the search triggers along with the old table
+    if sender.name == "apis" and search_supported(connections[using]):
+        repair_task_search(connections[using])
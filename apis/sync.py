@@ -0,0 +1,69 @@
+from datetime import timedelta
+from django.core import signing
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apis.constants import SYNC_WATERMARK_LAG_SECONDS, TOMBSTONE_PRUNE_BATCH_SIZE, TOMBSTONE_RETENTION_DAYS
+from apis.models import TaskTombstone
+
+WATERMARK_SALT = "apis.tasks.sync"
+
+
+class InvalidWatermark(Exception):
+    pass
+
+
+class ExpiredWatermark(InvalidWatermark):
+    pass
+
+
+def tombstone_cutoff(now=None):
+    """Tombstones older than this are pruned, so a watermark before it can miss removals."""
+    return (now or timezone.now()) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+
+def issue_watermark(moment=None):
+    """
+    Signs a watermark `SYNC_WATERMARK_LAG_SECONDS` before `moment`. Writers set
+    `updated_at` before they commit, so a change can become visible after a
+    later timestamp was handed out; the lag sends such changes again on the
+    next sync, and clients merge tasks and removals by id.
+    """
+    moment = (moment or timezone.now()) - timedelta(seconds=SYNC_WATERMARK_LAG_SECONDS)
+    return signing.dumps(moment.isoformat(), salt=WATERMARK_SALT)
+
+
+def read_watermark(watermark):
+    try:
+        moment = parse_datetime(signing.loads(watermark, salt=WATERMARK_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidWatermark("Invalid watermark")
+
+    if moment is None:
+        raise InvalidWatermark("Invalid watermark")
+    if moment < tombstone_cutoff():
+        raise ExpiredWatermark("Watermark expired, sync again without since")
+    return moment
+
+
+def prune_tombstones(batch_size=TOMBSTONE_PRUNE_BATCH_SIZE, max_batches=None):
+    """
+    Deletes tombstones older than the retention period in batches of
+    `batch_size`. Returns the number of tombstones removed.
+    """
+    removed = 0
+    batches = 0
+    cutoff = tombstone_cutoff()
+
+    while max_batches is None or batches < max_batches:
+        ids = list(
+            TaskTombstone.objects.filter(deleted_at__lt=cutoff)
+            .order_by("deleted_at").values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        TaskTombstone.objects.filter(id__in=ids).delete()
+        removed += len(ids)
+        batches += 1
+
+    return removed
@@ -0,0 +1,163 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from apis.routing import pin_to_primary
+from apis.serializers import TaskSerializer
+
+
+class CacheStats:
+    """Hit and miss counters kept in the cache itself, so they cover every process sharing it."""
+
+    def __init__(self, cache, prefix):
+        self.cache = cache
+        self.prefix = prefix
+
+    def count(self, name, amount=1):
+        key = f"{self.prefix}:stats:{name}"
+        try:
+            self.cache.incr(key, amount)
+        except ValueError:
+            self.cache.add(key, 0, timeout=None)
+            self.cache.incr(key, amount)
+
+    def stats(self):
+        keys = [f"{self.prefix}:stats:hits", f"{self.prefix}:stats:misses"]
+        counts = self.cache.get_many(keys)
+        hits, misses = counts.get(keys[0], 0), counts.get(keys[1], 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+
+class TaskListCache:
+    """
+    Caches rendered GetTasksView responses per user on a Django cache alias,
+    so eviction (LRU and TTL with the default local memory backend) is set in
+    CACHES. Every user has a generation value that is part of their keys;
+    invalidating replaces it, which orphans all cached variants of that
+    user's list (filters, pages, fields) without having to enumerate them.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def enabled(self):
+        return self.alias is not None
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def counters(self):
+        return CacheStats(self.cache, "tasks")
+
+    def generation_key(self, user_id):
+        return f"tasks:gen:{user_id}"
+
+    def key(self, user_id, path):
+        """
+        Read the key before querying the tasks, so a write that commits while
+        the response is built invalidates the entry that is about to be stored.
+        """
+        generation = self.cache.get(self.generation_key(user_id))
+        if generation is None:
+            generation = time.time_ns()
+            self.cache.add(self.generation_key(user_id), generation, timeout=None)
+        return f"tasks:list:{user_id}:{generation}:{hashlib.md5(path.encode()).hexdigest()}"
+
+    def get(self, key):
+        value = self.cache.get(key)
+        self.counters.count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key, value):
+        self.cache.set(key, value)
+
+    def invalidate(self, user_ids):
+        # A new, never used generation rather than an increment, so an evicted generation cannot come back
+        generation = time.time_ns()
+        self.cache.set_many({self.generation_key(user_id): generation for user_id in user_ids}, timeout=None)
+        # Until the replicas have the write, a list read from one would be cached under the new generation
+        pin_to_primary(user_ids)
+
+    def invalidate_on_commit(self, user_ids):
+        user_ids = set(user_ids)
+        if self.enabled and user_ids:
+            transaction.on_commit(lambda: self.invalidate(user_ids))
+
+    def stats(self):
+        return self.counters.stats()
+
+
+class TaskFragmentCache:
+    """
+    Caches each task's TaskSerializer output as rendered JSON bytes. Keys
+    include the task's and the assigned user's updated_at, so a changed task
+    simply misses and needs no invalidation, and only new or changed tasks
+    go through the serializer when a response is built.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.renderer = JSONRenderer()
+
+    @property
+    def enabled(self):
+        return self.alias is not None
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def counters(self):
+        return CacheStats(self.cache, "fragments")
+
+    def key(self, task):
+        return f"tasks:fragment:{task.id}:{task.updated_at.isoformat()}:{task.assigned_to.updated_at.isoformat()}"
+
+    def serialize(self, tasks):
+        return [self.renderer.render(data) for data in TaskSerializer(tasks, many=True).data]
+
+    def render_many(self, tasks):
+        """Returns the JSON bytes of each task in `tasks`, which need assigned_to loaded."""
+        tasks = list(tasks)
+        if not self.enabled:
+            return self.serialize(tasks)
+
+        keys = [self.key(task) for task in tasks]
+        fragments = self.cache.get_many(keys)
+        missing = [(key, task) for key, task in zip(keys, tasks) if key not in fragments]
+        if missing:
+            rendered = dict(zip((key for key, _ in missing), self.serialize([task for _, task in missing])))
+            self.cache.set_many(rendered)
+            fragments.update(rendered)
+
+        self.counters.count("hits", len(tasks) - len(missing))
+        self.counters.count("misses", len(missing))
+        return [fragments[key] for key in keys]
+
+    def stats(self):
+        return self.counters.stats()
+
+
+def json_array(fragments):
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def splice_json(context, key, raw):
+    """Renders `context` with the already rendered JSON `raw` added under `key`."""
+    body = JSONRenderer().render(context)
+    separator = b"," if context else b""
+    return body[:-1] + separator + JSONRenderer().render(key) + b":" + raw + b"}"
+
+
+task_list_cache = TaskListCache(getattr(settings, "TASK_LIST_CACHE_ALIAS", None))
+task_fragment_cache = TaskFragmentCache(getattr(settings, "TASK_FRAGMENT_CACHE_ALIAS", None))
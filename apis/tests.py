@@ -1,3 +1,385 @@
-from django.test import TestCase
+import re
+from io import StringIO
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apis.constants import ADMIN, SUPER_ADMIN, USER, STATUS_COMPLETED, STATUS_IN_PROGRESS, STATUS_PENDING, TOMBSTONE_RETENTION_DAYS
+from apis.counters import rebuild_completion_rollups, rebuild_task_counters
+from apis.models import ArchivedTask, DailyCompletionRollup, Task, TaskTombstone, User, UserTaskCounter
+from apis.services import save_task
+from apis.sync import issue_watermark
+from apis.views import login_tokens
 
-# Create your tests here.
+
+class QueryPlanTests(TestCase):
+    """
+    Runs the hot views and checks the SQLite query plan of every statement
+    they run on the app's tables. A full table scan, or an ORDER BY sorted
+    in a temporary B-tree (which sorts every matching row to return a page),
+    fails the test.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = User.objects.create_user(email="superadmin@example.com", password="pw", first_name="Super", role=SUPER_ADMIN)
+        cls.admin = User.objects.create_user(email="admin@example.com", password="pw", first_name="Admin", role=ADMIN)
+        cls.user = User.objects.create_user(email="user@example.com", password="pw", first_name="User", role=USER, assigned_admin=cls.admin)
+
+        today = date.today()
+        cls.tasks = [
+            Task.objects.create(
+                title=f"Task {number} report", description="Write the report", assigned_to=cls.user, owner_admin=cls.admin,
+                due_date=today + timedelta(days=number), status=STATUS_PENDING,
+            )
+            for number in range(3)
+        ]
+        cls.completed = Task.objects.create(
+            title="Completed report", description="Done", assigned_to=cls.user, owner_admin=cls.admin, due_date=today,
+            status=STATUS_COMPLETED, completion_report="Done", worked_hours=2,
+        )
+        archived = Task.objects.create(
+            title="Archived report", description="Done", assigned_to=cls.user, owner_admin=cls.admin, due_date=today,
+            status=STATUS_COMPLETED, completion_report="Done", worked_hours=1,
+        )
+        cls.archived = ArchivedTask.objects.create(**{
+            name: getattr(archived, name) for name in ArchivedTask.COPIED_FIELDS if name != "id"
+        }, id=archived.id + 1000)
+        rebuild_completion_rollups([cls.user.id])
+
+    def setUp(self):
+        # Cached task lists would skip the queries under test
+        caches["tasks"].clear()
+
+    def api_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_tokens(user)['access_token']}")
+        return client
+
+    def admin_client(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def plan_problems(self, sql, allow_sort):
+        problems = []
+        for step in self.query_plan(sql):
+            # "SEARCH", "SCAN ... USING INDEX" and full text lookups ("VIRTUAL TABLE INDEX") are fine
+            if step.startswith("SCAN ") and " USING " not in step and " VIRTUAL TABLE INDEX " not in step:
+                problems.append(step)
+            elif step == "USE TEMP B-TREE FOR ORDER BY" and not allow_sort:
+                problems.append(step)
+        return problems
+
+    def assertIndexed(self, run, allow_sort=False):
+        """Calls `run` and fails on any of its statements on the app's tables that scans or sorts."""
+        with CaptureQueriesContext(connection) as queries:
+            result = run()
+        if hasattr(result, "status_code"):
+            self.assertLess(result.status_code, 400, result.content[:500])
+
+        failures = []
+        for query in queries.captured_queries:
+            sql = query["sql"]
+            if not re.match(r"\s*(SELECT|UPDATE|DELETE)\b", sql) or '"apis_' not in sql:
+                continue
+            problems = self.plan_problems(sql, allow_sort)
+            if problems:
+                failures.append(f"{sql}\n    {problems}")
+        self.assertFalse(failures, "\n".join(failures))
+        return result
+
+    def test_task_list(self):
+        client = self.api_client(self.user)
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/"))
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/", {"status": STATUS_PENDING}))
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/", {"fields": "id,title,status", "include": "users"}))
+        page = self.assertIndexed(lambda: client.get("/api/v1/tasks/", {"page_size": 2})).json()
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/", {"page_size": 2, "cursor": page["next"]}))
+
+    def test_task_sync(self):
+        client = self.api_client(self.user)
+        watermark = self.assertIndexed(lambda: client.get("/api/v1/tasks/sync/")).json()["data"]["watermark"]
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/sync/", {"since": watermark}))
+
+    def test_task_report(self):
+        client = self.api_client(self.admin)
+        self.assertIndexed(lambda: client.get(f"/api/v1/tasks/{self.completed.id}/report/"))
+        self.assertIndexed(lambda: client.get(f"/api/v1/tasks/{self.archived.id}/report/"))
+
+    def test_summary_report(self):
+        since = {"from": (date.today() - timedelta(days=7)).isoformat()}
+        for user in (self.admin, self.superadmin):
+            with self.subTest(role=user.role):
+                client = self.api_client(user)
+                self.assertIndexed(lambda: client.get("/api/v1/tasks/reports/summary/"))
+                self.assertIndexed(lambda: client.get("/api/v1/tasks/reports/summary/", since))
+
+    def test_daily_report(self):
+        for user in (self.admin, self.superadmin):
+            with self.subTest(role=user.role):
+                client = self.api_client(user)
+                self.assertIndexed(lambda: client.get("/api/v1/tasks/reports/daily/", {"group_by": "user"}))
+
+    def test_task_search(self):
+        # Matches are ranked by bm25, which has to be sorted
+        client = self.api_client(self.admin)
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/search/", {"q": "report"}), allow_sort=True)
+        self.assertIndexed(lambda: client.get("/api/v1/tasks/search/", {"q": "report", "include": "users"}), allow_sort=True)
+
+    def test_manage_tasks_data(self):
+        client = self.admin_client(self.admin)
+        # What the Manage Tasks table requests first, and the keyset pages for API style clients
+        self.assertIndexed(lambda: client.get("/manage_tasks/data/", {"draw": 1, "start": 0, "length": 10, "order[0][column]": 0, "order[0][dir]": "asc"}))
+        self.assertIndexed(lambda: client.get("/manage_tasks/data/", {"draw": 1, "length": 10, "cursor": ""}))
+
+    def test_task_reports_page(self):
+        for user in (self.admin, self.superadmin):
+            with self.subTest(role=user.role):
+                client = self.admin_client(user)
+                self.assertIndexed(lambda: client.get("/task_reports/"))
+
+    def test_assigned_users(self):
+        client = self.admin_client(self.admin)
+        self.assertIndexed(lambda: client.get("/assigned_users/"))
+
+    def test_add_task_duplicate_title(self):
+        client = self.admin_client(self.admin)
+        self.assertIndexed(lambda: client.post("/add_task/", {
+            "title": "TASK 0 REPORT", "description": "Again", "assigned_to": self.user.id,
+            "due_date": date.today().isoformat(), "status": STATUS_PENDING,
+        }))
+        self.assertEqual(Task.objects.filter(title__iexact="task 0 report").count(), 1)
+        ArchivedTask.objects.filter(id=self.archived.id).update(title="Old report")
+        self.assertIndexed(lambda: client.post("/add_task/", {
+            "title": "OLD REPORT", "description": "Again", "assigned_to": self.user.id,
+            "due_date": date.today().isoformat(), "status": STATUS_PENDING,
+        }))
+        self.assertFalse(Task.objects.filter(title__iexact="old report").exists())
+
+    def test_prune_task_tombstones(self):
+        TaskTombstone.objects.create(task_id=self.archived.id, user=self.user)
+        TaskTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=365))
+        self.assertIndexed(lambda: call_command("prune_task_tombstones", stdout=StringIO()))
+        self.assertFalse(TaskTombstone.objects.exists())
+
+    def test_archive_completed_tasks(self):
+        Task.objects.filter(id=self.completed.id).update(completed_at=timezone.now() - timedelta(days=365))
+        self.assertIndexed(lambda: call_command("archive_completed_tasks", stdout=StringIO()))
+        self.assertTrue(ArchivedTask.objects.filter(id=self.completed.id).exists())
+
+
+class TaskWriteTestCase(TestCase):
+    """Users, a few tasks and clients for the behavior tests of the task write paths."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = User.objects.create_user(
+            email="superadmin@example.com", password="pw", first_name="Super", role=SUPER_ADMIN, is_staff=True, is_superuser=True,
+        )
+        cls.admin = User.objects.create_user(email="admin@example.com", password="pw", first_name="Admin", role=ADMIN)
+        cls.user = User.objects.create_user(email="user@example.com", password="pw", first_name="User", role=USER, assigned_admin=cls.admin)
+        cls.other_user = User.objects.create_user(email="other@example.com", password="pw", first_name="Other", role=USER, assigned_admin=cls.admin)
+
+        cls.today = date.today()
+        cls.pending = save_task(Task(title="Pending", description="Do it", assigned_to=cls.user, due_date=cls.today, status=STATUS_PENDING))
+        cls.in_progress = save_task(Task(title="In progress", description="Doing it", assigned_to=cls.user, due_date=cls.today, status=STATUS_IN_PROGRESS))
+
+    def setUp(self):
+        caches["tasks"].clear()
+
+    def api_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_tokens(user)['access_token']}")
+        return client
+
+    def admin_client(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def write(self, run):
+        """Runs a write with its on_commit hooks, as outside a test transaction."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return run()
+
+    def task_form(self, task, **values):
+        return {
+            "title": task.title, "description": task.description, "assigned_to": task.assigned_to_id,
+            "due_date": self.today.isoformat(), "status": task.status, **values,
+        }
+
+
+class CounterConsistencyTests(TaskWriteTestCase):
+    """
+    After every write path the per-user counters and daily rollups, which the
+    writes update incrementally, must match what the rebuilds compute from
+    the tasks.
+    """
+
+    def snapshot(self):
+        counters = {
+            row[0]: row[1:]
+            for row in UserTaskCounter.objects.values_list("user_id", "pending", "in_progress", "completed", "worked_hours")
+            if any(row[1:])
+        }
+        rollups = {
+            (row[0], row[1]): row[2:]
+            for row in DailyCompletionRollup.objects.values_list("user_id", "day", "completed", "worked_hours")
+        }
+        return counters, rollups
+
+    def assertCountersConsistent(self):
+        incremental = self.snapshot()
+        user_ids = list(User.objects.values_list("id", flat=True))
+        rebuild_task_counters(user_ids)
+        rebuild_completion_rollups(user_ids)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_status_api(self):
+        client = self.api_client(self.user)
+        response = self.write(lambda: client.put(
+            f"/api/v1/tasks/{self.pending.id}/", {"status": "completed", "completion_report": "Done", "worked_hours": "1.234"}, format="json",
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(UserTaskCounter.objects.get(user=self.user).worked_hours, Decimal("1.23"))
+        self.assertCountersConsistent()
+
+    def test_bulk_status_api(self):
+        client = self.api_client(self.user)
+        response = self.write(lambda: client.put("/api/v1/tasks/status/", {"tasks": [
+            {"id": self.pending.id, "status": "completed", "completion_report": "Done", "worked_hours": 2},
+            {"id": self.in_progress.id, "status": "pending"},
+        ]}, format="json"))
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersConsistent()
+
+    def test_admin_panel_add_edit_delete(self):
+        client = self.admin_client(self.admin)
+        self.write(lambda: client.post("/add_task/", self.task_form(self.pending, title="Added")))
+        added = Task.objects.get(title="Added")
+        self.assertCountersConsistent()
+
+        form = self.task_form(added, status=STATUS_COMPLETED, completion_report="Done", worked_hours="2.345", task_id=added.id, version=added.version)
+        self.write(lambda: client.post("/update_task/", form))
+        self.assertEqual(Task.objects.get(id=added.id).status, STATUS_COMPLETED)
+        self.assertCountersConsistent()
+
+        form = self.task_form(self.in_progress, assigned_to=self.other_user.id, task_id=self.in_progress.id)
+        self.write(lambda: client.post("/update_task/", form))
+        self.assertEqual(Task.objects.get(id=self.in_progress.id).assigned_to_id, self.other_user.id)
+        self.assertCountersConsistent()
+
+        self.write(lambda: client.post("/delete_task/", {"task_id": added.id}))
+        self.assertFalse(Task.objects.filter(id=added.id).exists())
+        self.assertCountersConsistent()
+
+    def test_django_admin(self):
+        client = self.admin_client(self.superadmin)
+        self.write(lambda: client.post("/admin/apis/task/add/", self.task_form(self.pending, title="Added")))
+        added = Task.objects.get(title="Added")
+        self.assertCountersConsistent()
+
+        form = self.task_form(added, status=STATUS_COMPLETED, completion_report="Done", worked_hours="3")
+        self.write(lambda: client.post(f"/admin/apis/task/{added.id}/change/", form))
+        self.assertEqual(Task.objects.get(id=added.id).status, STATUS_COMPLETED)
+        self.assertCountersConsistent()
+
+        self.write(lambda: client.post(f"/admin/apis/task/{added.id}/delete/", {"post": "yes"}))
+        self.assertFalse(Task.objects.filter(id=added.id).exists())
+        self.assertCountersConsistent()
+
+    def test_archive_command(self):
+        client = self.api_client(self.user)
+        self.write(lambda: client.put(
+            f"/api/v1/tasks/{self.pending.id}/", {"status": "completed", "completion_report": "Done", "worked_hours": 4}, format="json",
+        ))
+        Task.objects.filter(id=self.pending.id).update(completed_at=timezone.now() - timedelta(days=365))
+        rebuild_completion_rollups([self.user.id])
+
+        self.write(lambda: call_command("archive_completed_tasks", stdout=StringIO()))
+        self.assertTrue(ArchivedTask.objects.filter(id=self.pending.id).exists())
+        self.assertCountersConsistent()
+
+
+class ConcurrentUpdateTests(TaskWriteTestCase):
+
+    def test_stale_if_match_is_rejected(self):
+        client = self.api_client(self.user)
+        response = client.put(
+            f"/api/v1/tasks/{self.pending.id}/", {"status": "in_progress"}, format="json", HTTP_IF_MATCH=f'"{self.pending.version + 1}"',
+        )
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(Task.objects.get(id=self.pending.id).status, STATUS_PENDING)
+
+    def test_concurrent_write_is_not_overwritten(self):
+        completed_at_after = Task.completed_at_after
+
+        def write_meanwhile(task, *args):
+            # Another request updates the task between the read and the guarded UPDATE
+            Task.objects.filter(id=self.pending.id).update(title="Changed meanwhile", version=F("version") + 1)
+            return completed_at_after(task, *args)
+
+        client = self.api_client(self.user)
+        with mock.patch.object(Task, "completed_at_after", autospec=True, side_effect=write_meanwhile):
+            response = client.put(f"/api/v1/tasks/{self.pending.id}/", {"status": "in_progress"}, format="json")
+        self.assertEqual(response.status_code, 409)
+        # The simulated write shares the request's transaction here, so it is rolled back with it
+        self.assertEqual(Task.objects.get(id=self.pending.id).status, STATUS_PENDING)
+
+
+class SyncTests(TaskWriteTestCase):
+
+    def sync(self, user, since=None):
+        response = self.api_client(user).get("/api/v1/tasks/sync/", {"since": since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_removed_tasks_are_sent_as_deleted(self):
+        watermark = self.sync(self.user)["watermark"]
+        other_watermark = self.sync(self.other_user)["watermark"]
+
+        client = self.admin_client(self.admin)
+        self.write(lambda: client.post("/delete_task/", {"task_id": self.pending.id}))
+        form = self.task_form(self.in_progress, assigned_to=self.other_user.id, task_id=self.in_progress.id)
+        self.write(lambda: client.post("/update_task/", form))
+
+        data = self.sync(self.user, watermark)
+        self.assertEqual(sorted(data["deleted"]), sorted([self.pending.id, self.in_progress.id]))
+        self.assertEqual(data["tasks"], [])
+        data = self.sync(self.other_user, other_watermark)
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.in_progress.id])
+        self.assertEqual(data["deleted"], [])
+
+    def test_expired_watermark_is_gone(self):
+        watermark = issue_watermark(timezone.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS + 1))
+        response = self.api_client(self.user).get("/api/v1/tasks/sync/", {"since": watermark})
+        self.assertEqual(response.status_code, 410)
+
+
+class TaskListCacheTests(TaskWriteTestCase):
+
+    def test_write_invalidates_cached_list_and_etag(self):
+        client = self.api_client(self.user)
+        first = client.get("/api/v1/tasks/")
+        self.assertEqual(client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        self.write(lambda: client.put(f"/api/v1/tasks/{self.pending.id}/", {"status": "in_progress"}, format="json"))
+
+        second = client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        statuses = {task["id"]: task["status"] for task in second.json()["data"]}
+        self.assertEqual(statuses[self.pending.id], STATUS_IN_PROGRESS)
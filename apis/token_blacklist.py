@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    """
+    Process-local Bloom filter over the jtis of blacklisted, unexpired refresh
+    tokens. A negative answer lets the refresh skip the blacklist query, a
+    positive one falls back to the database. Tokens blacklisted by another
+    process are only seen after the next rebuild, so `refresh_interval` is the
+    longest window in which such a token could still be refreshed here.
+    """
+
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self._filter = None
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    def rebuild(self):
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list("token__jti", flat=True)
+        )
+        bloom = BloomFilter(capacity=max(len(jtis) * 2, 1024))
+        for jti in jtis:
+            bloom.add(jti)
+
+        with self._lock:
+            self._filter = bloom
+            self._built_at = time.monotonic()
+
+    def might_contain(self, jti):
+        if self._filter is None or time.monotonic() - self._built_at > self.refresh_interval:
+            self.rebuild()
+        return jti in self._filter
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+
+blacklist_filter = BlacklistFilter(refresh_interval=getattr(settings, "TOKEN_BLACKLIST_FILTER_REFRESH", 30))
+
+
+class FilteredRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+def prune_expired_tokens(batch_size=1000, max_batches=None):
+    """
+    Deletes expired outstanding tokens and their blacklist entries in batches
+    of `batch_size`, so no single statement holds the database for long.
+    Returns the number of outstanding tokens removed.
+    """
+    removed = 0
+    batches = 0
+    now = timezone.now()
+
+    while max_batches is None or batches < max_batches:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        removed += len(ids)
+        batches += 1
+
+    return removed
+
+
+_pruner_started = False
+
+
+def start_background_pruner(interval, batch_size=1000):
+    global _pruner_started
+    if _pruner_started:
+        return
+    _pruner_started = True
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                removed = prune_expired_tokens(batch_size=batch_size)
+                if removed:
+                    logger.info("Pruned %s expired refresh tokens", removed)
+            except Exception:
+                logger.exception("Pruning expired refresh tokens failed")
+            finally:
+                close_old_connections()
+
+    threading.Thread(target=run, name="token-blacklist-pruner", daemon=True).start()
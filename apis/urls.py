@@ -1,10 +1,25 @@
 from django.urls import path
 from apis.views import *
+from apis.async_views import AsyncLoginView, AsyncGetTasksView, AsyncUpdateTaskStatusView, AsyncTaskReportView
 
 
 urlpatterns = [
     path('Login/', LoginView.as_view(), name='Login'),
+    path('token/refresh/', RefreshTokenView.as_view(), name='token_refresh'),
     path('tasks/', GetTasksView.as_view(), name='get_tasks'),
+    path('tasks/status/', BulkUpdateTaskStatusView.as_view(), name='bulk_update_task_status'),
+    path('tasks/search/', TaskSearchView.as_view(), name='api_search_tasks'),
+    path('tasks/sync/', SyncTasksView.as_view(), name='sync_tasks'),
     path('tasks/<int:id>/', UpdateTaskStatusView.as_view(), name='update_task_status'),
     path('tasks/<int:id>/report/', TaskReportView.as_view(), name='task_report'),
+    path('tasks/reports/summary/', TaskSummaryReportView.as_view(), name='task_summary_report'),
+    path('tasks/reports/daily/', TaskDailyReportView.as_view(), name='task_daily_report'),
+    path('metrics/cache/', CacheMetricsView.as_view(), name='cache_metrics'),
+    path('metrics/password_hashing/', PasswordHashMetricsView.as_view(), name='password_hash_metrics'),
+    
+    # Async versions of the hot endpoints, for ASGI deployments
+    path('async/Login/', AsyncLoginView.as_view(), name='async_login'),
+    path('async/tasks/', AsyncGetTasksView.as_view(), name='async_get_tasks'),
+    path('async/tasks/<int:id>/', AsyncUpdateTaskStatusView.as_view(), name='async_update_task_status'),
+    path('async/tasks/<int:id>/report/', AsyncTaskReportView.as_view(), name='async_task_report'),
 ]
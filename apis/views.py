@@ -1,19 +1,97 @@
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema, OpenApiResponse
-from apis.models import Task, User
-from apis.serializers import LoginSerializer, TaskSerializer, UpdateTaskStatusSerializer
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from apis.models import ArchivedTask, DailyCompletionRollup, Task, TaskTombstone, User
+from apis.serializers import (
+    LoginSerializer, RefreshTokenSerializer, TaskSerializer, TaskValuesSerializer, UpdateTaskStatusSerializer,
+    BulkUpdateTaskStatusSerializer, sideload_users,
+)
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+from apis.token_blacklist import FilteredRefreshToken
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from apis.constants import STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED
+from apis.authentication import ClaimsJWTAuthentication
+from apis.constants import (
+    STATUS_COMPLETED, TASK_PAGE_SIZE, TASK_MAX_PAGE_SIZE, BULK_STATUS_MAX_ITEMS,
+    DAILY_REPORT_DEFAULT_DAYS, DAILY_REPORT_MAX_DAYS, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE,
+)
+from apis.pagination import KeysetPaginator, InvalidCursor
+from apis.conditional import (
+    task_list_validators, task_validators, not_modified_response, set_validators, version_etag, parse_if_match_version,
+)
+from apis.sync import issue_watermark, read_watermark, ExpiredWatermark, InvalidWatermark
+from apis.services import clean_status_change, check_status_transition, update_task_status, StatusChangeError, VersionConflict
+from apis.counters import apply_task_changes, task_state
+from apis.task_cache import task_list_cache, task_fragment_cache, json_array, splice_json
+from apis.routing import ReplicaReadAPIMixin
+from apis.search import search_tasks
+from apis.hashing import check_user_password, password_hash_pool, HashPoolSaturated
+from django.core.paginator import InvalidPage, Paginator
+from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta
+from decimal import Decimal
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def parse_date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{name} must be a valid date (YYYY-MM-DD)")
+    return parsed
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class RequestError(Exception):
+    """A 4xx error from the steps the sync and async views share, rendered as {"error": message} by each."""
+    
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def format_hours(value):
+    if value is None:
+        return None
+    return f"{Decimal(value).quantize(Decimal('0.01')):f}"
+
+
+def finish_summary(summary):
+    hours_count = summary.pop("hours_count")
+    total_hours = summary["total_hours"]
+    summary["average_hours"] = format_hours(total_hours / hours_count) if hours_count else None
+    summary["total_hours"] = format_hours(total_hours)
+    return summary
+
+
+def login_tokens(user):
+    refresh = FilteredRefreshToken.for_user(user)
+    refresh["email"] = user.email
+    refresh["role"] = user.role
+    refresh["id"] = user.id
+    
+    return {
+        "access_token": str(refresh.access_token),
+        "refresh_token": str(refresh)
+    }
+
+
 # Login API
 @extend_schema(tags=["User Management"])
 class LoginView(CreateAPIView):
@@ -31,57 +109,249 @@ class LoginView(CreateAPIView):
             user = User.objects.get(email=email)
             if not user.is_active:
                 return Response({"error": "Account is not active, please contact admin"}, status=status.HTTP_400_BAD_REQUEST)  
-            if not user.check_password(password):
+            try:
+                valid = check_user_password(user, password)
+            except HashPoolSaturated as e:
+                return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"})
+            if not valid:
                 return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
             
-            refresh = RefreshToken.for_user(user)
-            refresh["email"] = user.email
-            refresh["role"] = user.role
-            refresh["id"] = user.id
-            
-            response_context = {
-                "access_token": str(refresh.access_token),
-                "refresh_token": str(refresh)
-            }
-
-            return Response({"message": "Login successful", "data": response_context}, status=status.HTTP_200_OK)
+            return Response({"message": "Login successful", "data": login_tokens(user)}, status=status.HTTP_200_OK)
         except User.DoesNotExist:
             return Response({"error": "No account found in this email"}, status=status.HTTP_400_BAD_REQUEST)  
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# Refresh Token API
+@extend_schema(tags=["User Management"])
+class RefreshTokenView(TokenRefreshView):
+    serializer_class = RefreshTokenSerializer
+
+
+class TaskFieldsMixin:
+    """
+    The fields and include=users query parameters of the task list APIs.
+    Either one switches the response from full tasks, each with its assigned
+    user nested, to values() rows, with the users sideloaded once in a top
+    level map for include=users.
+    """
+    
+    def get_includes(self):
+        includes = set(filter(None, self.request.query_params.get("include", "").split(",")))
+        if includes - {"users"}:
+            raise ValueError("include only supports users")
+        return includes
+    
+    def get_values_serializer(self, includes):
+        fields = self.request.query_params.get("fields")
+        if fields is None and "users" not in includes:
+            return None
+        
+        fields = TaskValuesSerializer.parse_fields(fields) if fields else list(TaskValuesSerializer.FIELDS)
+        if "users" in includes and "assigned_to_id" not in fields:
+            fields.append("assigned_to_id")
+        return TaskValuesSerializer(fields)
+    
+    def render_tasks(self, tasks, values_serializer):
+        if values_serializer:
+            return JSONRenderer().render(values_serializer.serialize(tasks))
+        return json_array(task_fragment_cache.render_many(tasks))
+    
+    
 # Get Tasks API
-@extend_schema(tags=["Task Management"])
-class GetTasksView(ListAPIView):
+@extend_schema(
+    tags=["Task Management"],
+    parameters=[
+        OpenApiParameter("status", str, description="Filter by task status"),
+        OpenApiParameter("due_date_from", str, description="Tasks due on or after this date (YYYY-MM-DD)"),
+        OpenApiParameter("due_date_to", str, description="Tasks due on or before this date (YYYY-MM-DD)"),
+        OpenApiParameter("page_size", int, description="Enables cursor pagination with this page size"),
+        OpenApiParameter("cursor", str, description="The next or prev cursor from a previous page"),
+        OpenApiParameter("fields", str, description="Comma separated list of fields to return, e.g. id,title,status,due_date"),
+        OpenApiParameter("include", str, description="Pass users to return assigned users once in a top level users map"),
+    ]
+)
+class GetTasksView(ReplicaReadAPIMixin, TaskFieldsMixin, ListAPIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     serializer_class = TaskSerializer
 
     def get_queryset(self):
-        return Task.objects.filter(assigned_to=self.request.user)
+        return Task.objects.select_related("assigned_to").filter(assigned_to_id=self.request.user.id)
+    
+    def filter_queryset(self, queryset):
+        params = self.request.query_params
+        
+        task_status = params.get("status")
+        if task_status:
+            if task_status not in dict(Task.STATUS_CHOICES):
+                raise ValueError("Invalid status value")
+            queryset = queryset.filter(status=task_status)
+        
+        for param, lookup in (("due_date_from", "due_date__gte"), ("due_date_to", "due_date__lte")):
+            due_date = parse_date_param(params, param)
+            if due_date:
+                queryset = queryset.filter(**{lookup: due_date})
+        
+        return queryset
     
+    def get_page_size(self):
+        page_size = self.request.query_params.get("page_size")
+        if page_size is None:
+            return TASK_PAGE_SIZE
+        
+        page_size = int(page_size)
+        if page_size <= 0:
+            raise ValueError("page_size must be greater than 0")
+        return min(page_size, TASK_MAX_PAGE_SIZE)
+    
+    def cached_response(self, request, etag, last_modified, body):
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(HttpResponse(body, content_type="application/json"), etag, last_modified)
+    
+    def read_list(self, request):
+        """
+        Everything up to rendering, shared with the async view: the cached
+        body, the parameters, the validators and the tasks of the page.
+        Returns a response when the cache or the client's validators answer
+        the request, otherwise (tasks, values_serializer, response_context,
+        validators). Raises RequestError for a bad request.
+        """
+        if not request.user.is_user():
+            raise RequestError("You are not a user", status.HTTP_403_FORBIDDEN)
+        
+        cache_key = None
+        if task_list_cache.enabled:
+            cache_key = task_list_cache.key(request.user.id, request.get_full_path())
+            cached = task_list_cache.get(cache_key)
+            if cached is not None:
+                return self.cached_response(request, *cached)
+        
+        try:
+            tasks = self.filter_queryset(self.get_queryset())
+            includes = self.get_includes()
+            values_serializer = self.get_values_serializer(includes)
+        except ValueError as e:
+            raise RequestError(str(e))
+        
+        etag, last_modified = task_list_validators(request, tasks)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        # Sparse fieldsets read plain rows, the pagination keys are always fetched
+        if values_serializer:
+            tasks = tasks.values(*{"id", "updated_at", *values_serializer.fields})
+        
+        # Cursor pagination is opt-in so existing clients keep receiving the full list
+        response_context = {"message": "Tasks retrieved successfully"}
+        cursor = request.query_params.get("cursor")
+        if cursor is None and "page_size" not in request.query_params:
+            tasks = list(tasks)
+        else:
+            try:
+                page_size = self.get_page_size()
+            except ValueError:
+                raise RequestError("page_size must be a positive integer")
+            
+            try:
+                tasks, next_cursor, prev_cursor = KeysetPaginator(tasks, page_size).paginate(cursor)
+            except InvalidCursor as e:
+                raise RequestError(str(e))
+            response_context["next"] = next_cursor
+            response_context["prev"] = prev_cursor
+        
+        if "users" in includes:
+            response_context["users"] = sideload_users(tasks)
+        return tasks, values_serializer, response_context, (cache_key, etag, last_modified)
+    
+    def list_response(self, body, validators):
+        cache_key, etag, last_modified = validators
+        if cache_key:
+            task_list_cache.set(cache_key, (etag, last_modified, body))
+        return set_validators(HttpResponse(body, content_type="application/json"), etag, last_modified)
+    
+    def list(self, request, *args, **kwargs):
+        try:
+            result = self.read_list(request)
+        except RequestError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+        if isinstance(result, HttpResponse):
+            return result
+        
+        # Full tasks are joined from per-task JSON fragments, so only changed tasks are serialized again
+        tasks, values_serializer, response_context, validators = result
+        return self.list_response(splice_json(response_context, "data", self.render_tasks(tasks, values_serializer)), validators)
+    
+    
+# Sync Tasks API
+@extend_schema(
+    tags=["Task Management"],
+    parameters=[
+        OpenApiParameter("since", str, description="Watermark returned by the previous sync. Omit it for a full sync"),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(description="Tasks synced successfully"),
+        status.HTTP_410_GONE: OpenApiResponse(description="The watermark is older than the tombstone retention, sync again without since"),
+    }
+)
+class SyncTasksView(ListAPIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+    serializer_class = TaskSerializer
+
     def list(self, request, *args, **kwargs):
         if not self.request.user.is_user():
             return Response({"error": "You are not a user"}, status=status.HTTP_403_FORBIDDEN)
         
-        tasks = self.get_queryset()
-        serializer = self.get_serializer(tasks, many=True)
+        since = request.query_params.get("since")
+        try:
+            since = read_watermark(since) if since else None
+        except ExpiredWatermark as e:
+            # Older removals may have been pruned already
+            return Response({"error": str(e)}, status=status.HTTP_410_GONE)
+        except InvalidWatermark as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Taken before reading, and lagged, so that writes racing with this sync are sent again next time
+        watermark = issue_watermark(timezone.now())
         
-        return Response({"message": "Tasks retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        tasks = Task.objects.select_related("assigned_to").filter(assigned_to_id=request.user.id)
+        deleted = []
+        if since:
+            tasks = tasks.filter(updated_at__gt=since)
+            deleted = list(
+                TaskTombstone.objects.filter(user_id=request.user.id, deleted_at__gt=since)
+                .values_list("task_id", flat=True).distinct()
+            )
+        
+        response_context = {
+            "deleted": deleted,
+            "watermark": watermark,
+        }
+        data = splice_json(response_context, "tasks", json_array(task_fragment_cache.render_many(tasks)))
+        return HttpResponse(splice_json({"message": "Tasks synced successfully"}, "data", data), content_type="application/json")
     
     
 # Update Task Status API
 @extend_schema(
     tags=["Task Management"],
     request=UpdateTaskStatusSerializer,
+    parameters=[
+        OpenApiParameter("If-Match", str, OpenApiParameter.HEADER, description="The task version the change is based on, as returned in `version` or the ETag header"),
+    ],
     responses={
-        status.HTTP_200_OK: OpenApiResponse(description="Task status updated successfully")
+        status.HTTP_200_OK: OpenApiResponse(description="Task status updated successfully"),
+        status.HTTP_409_CONFLICT: OpenApiResponse(description="The task was changed by a concurrent request"),
+        status.HTTP_412_PRECONDITION_FAILED: OpenApiResponse(description="The task version does not match If-Match"),
     }
 )
 class UpdateTaskStatusView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
 
     def put(self, request, *args, **kwargs):
         try:
@@ -89,81 +359,450 @@ class UpdateTaskStatusView(APIView):
                 return Response({"error": "You are not a user"}, status=status.HTTP_403_FORBIDDEN)
         
             task_id = kwargs.get("id")
-            task_status = request.data.get("status")
-            if not task_status:
-                return Response({"error": "Status is required"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            status_lower = task_status.lower()
-            status_map = {
-                'pending': STATUS_PENDING,
-                'in_progress': STATUS_IN_PROGRESS,
-                'completed': STATUS_COMPLETED
-            }
-            if status_lower not in status_map:
-                return Response({"error": "Invalid status value"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                values = clean_status_change(
+                    request.data.get("status"),
+                    request.data.get("completion_report"),
+                    request.data.get("worked_hours"),
+                )
+            except StatusChangeError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            try:
+                expected_version = parse_if_match_version(request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            status_value = status_map[status_lower]
+            try:
+                version = update_task_status(task_id, values, assigned_to_id=request.user.id, expected_version=expected_version)
+            except StatusChangeError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            except VersionConflict as e:
+                if expected_version is not None:
+                    return Response({"error": str(e)}, status=status.HTTP_412_PRECONDITION_FAILED)
+                return Response({"error": f"{e}, please retry"}, status=status.HTTP_409_CONFLICT)
             
-            task = Task.objects.get(id=task_id)
+            response = Response({"message": "Task status updated successfully", "data": {"id": task_id, "version": version}}, status=status.HTTP_200_OK)
+            response["ETag"] = version_etag(version)
+            return response
+        except Task.DoesNotExist:
+            return Response({"error": "No task found with this ID"}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    
+# Bulk Update Task Status API
+@extend_schema(
+    tags=["Task Management"],
+    request=BulkUpdateTaskStatusSerializer,
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(description="Task statuses processed, with a result for each item")
+    }
+)
+class BulkUpdateTaskStatusView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def put(self, request, *args, **kwargs):
+        try:
+            if not self.request.user.is_user():
+                return Response({"error": "You are not a user"}, status=status.HTTP_403_FORBIDDEN)
             
-            if task.status == STATUS_COMPLETED and status != STATUS_COMPLETED:
-                return Response({"error": "A completed task cannot be reverted to previous status"}, status=status.HTTP_400_BAD_REQUEST)
+            items = request.data.get("tasks") if isinstance(request.data, dict) else None
+            if not isinstance(items, list) or not items:
+                return Response({"error": "tasks must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+            if len(items) > BULK_STATUS_MAX_ITEMS:
+                return Response({"error": f"A maximum of {BULK_STATUS_MAX_ITEMS} tasks can be updated at once"}, status=status.HTTP_400_BAD_REQUEST)
             
-            if status_value == STATUS_COMPLETED:
-                completion_report = request.data.get("completion_report", "").strip()
-                worked_hours = request.data.get("worked_hours")
-                
-                if not completion_report or worked_hours is None:
-                    return Response({"error": "Completion report and worked hours are required when marking task as completed"}, status=status.HTTP_400_BAD_REQUEST)
-                
+            results = [None] * len(items)
+            changes = []
+            for index, item in enumerate(items):
+                if not isinstance(item, dict):
+                    results[index] = {"id": None, "updated": False, "error": "Invalid item"}
+                    continue
                 try:
-                    worked_hours_val = float(worked_hours)
-                except ValueError:
-                    return Response({"error": "Worked hours must be a valid number"}, status=status.HTTP_400_BAD_REQUEST)
+                    task_id = int(item.get("id"))
+                except (TypeError, ValueError):
+                    results[index] = {"id": item.get("id"), "updated": False, "error": "Task ID is required"}
+                    continue
+                try:
+                    values = clean_status_change(item.get("status"), item.get("completion_report"), item.get("worked_hours"))
+                except StatusChangeError as e:
+                    results[index] = {"id": task_id, "updated": False, "error": str(e)}
+                    continue
+                try:
+                    expected_version = int(item["version"]) if item.get("version") is not None else None
+                except (TypeError, ValueError):
+                    results[index] = {"id": task_id, "updated": False, "error": "Version must be an integer"}
+                    continue
+                changes.append((index, task_id, values, expected_version))
+            
+            with transaction.atomic():
+                tasks = Task.objects.select_for_update().filter(
+                    id__in={task_id for _, task_id, _, _ in changes}, assigned_to_id=request.user.id
+                ).in_bulk()
                 
-                if worked_hours_val <= 0:
-                    return Response({"error": "Worked hours must be greater than 0"}, status=status.HTTP_400_BAD_REQUEST)
+                now = timezone.now()
+                updated = {}
+                previous_states = {}
+                for index, task_id, values, expected_version in changes:
+                    task = tasks.get(task_id)
+                    if task is None:
+                        results[index] = {"id": task_id, "updated": False, "error": "No task found with this ID"}
+                        continue
+                    if expected_version is not None and expected_version != task.version:
+                        results[index] = {"id": task_id, "updated": False, "error": "Task was modified by another request"}
+                        continue
+                    try:
+                        check_status_transition(task.status, values["status"])
+                    except StatusChangeError as e:
+                        results[index] = {"id": task_id, "updated": False, "error": str(e)}
+                        continue
                     
-                task.completion_report = completion_report
-                task.worked_hours = worked_hours_val
-            else:
-                task.completion_report = None
-                task.worked_hours = None
+                    previous_states.setdefault(task_id, task_state(task))
+                    task.completed_at = task.completed_at_after(values["status"], now)
+                    task.status = values["status"]
+                    task.completion_report = values["completion_report"]
+                    task.worked_hours = values["worked_hours"]
+                    # bulk_update() does not apply auto_now
+                    task.updated_at = now
+                    task.version += 1
+                    updated[task_id] = task
+                    results[index] = {"id": task_id, "updated": True, "version": task.version}
                 
-            task.status = status_value
-            task.save()
+                Task.objects.bulk_update(updated.values(), ["status", "completion_report", "worked_hours", "completed_at", "updated_at", "version"])
+                apply_task_changes([(previous_states[task_id], task_state(task)) for task_id, task in updated.items()])
+                # bulk_update() sends no post_save signals
+                if updated:
+                    task_list_cache.invalidate_on_commit([request.user.id])
             
-            return Response({"message": "Task status updated successfully"}, status=status.HTTP_200_OK)
-        except Task.DoesNotExist:
-            return Response({"error": "No task found with this ID"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"message": "Task statuses processed successfully", "data": results}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     
 # Task Report API
 @extend_schema(tags=["Task Management"])
-class TaskReportView(RetrieveAPIView):
+class TaskReportView(ReplicaReadAPIMixin, RetrieveAPIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     serializer_class = TaskSerializer
 
+    def read_report(self, request, task_id):
+        """
+        Loads the completed task for the report, shared with the async view.
+        Returns the task, or a 304 response when the client's copy is
+        current. Raises RequestError for a bad request.
+        """
+        if request.user.is_superadmin():
+            lookup = {"id": task_id}
+        elif request.user.is_admin():
+            lookup = {"id": task_id, "owner_admin_id": request.user.id}
+        else:
+            raise RequestError("You are not an admin", status.HTTP_403_FORBIDDEN)
+        
+        try:
+            task = Task.objects.select_related("assigned_to").get(**lookup)
+        except Task.DoesNotExist:
+            # Old completed tasks are moved to the archive
+            try:
+                task = ArchivedTask.objects.select_related("assigned_to").get(**lookup)
+            except ArchivedTask.DoesNotExist:
+                raise RequestError("No task found with this ID")
+        
+        if task.status != STATUS_COMPLETED:
+            raise RequestError("Task is not completed")
+        
+        etag, last_modified = task_validators(task)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return task
+    
+    def report_response(self, task, fragment):
+        etag, last_modified = task_validators(task)
+        response = HttpResponse(splice_json({"message": "Task report retrieved successfully"}, "data", fragment), content_type="application/json")
+        return set_validators(response, etag, last_modified)
+    
     def retrieve(self, request, *args, **kwargs):
         try:
-            task_id = kwargs.get("id")
+            task = self.read_report(request, kwargs.get("id"))
+            if isinstance(task, HttpResponse):
+                return task
+            return self.report_response(task, task_fragment_cache.render_many([task])[0])
+        except RequestError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        
+# Task Summary Report API
+@extend_schema(
+    tags=["Task Management"],
+    parameters=[
+        OpenApiParameter("from", str, description="Only tasks completed on or after this date (YYYY-MM-DD)"),
+        OpenApiParameter("to", str, description="Only tasks completed on or before this date (YYYY-MM-DD)"),
+    ]
+)
+class TaskSummaryReportView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            # Completed tasks are in Task until they are archived
+            tiers = [Task.objects.filter(status=STATUS_COMPLETED), ArchivedTask.objects.all()]
+            if request.user.is_admin():
+                tiers = [tasks.filter(owner_admin_id=request.user.id) for tasks in tiers]
+            elif not request.user.is_superadmin():
+                return Response({"error": "You are not an admin"}, status=status.HTTP_403_FORBIDDEN)
+            
+            try:
+                date_from = parse_date_param(request.query_params, "from")
+                date_to = parse_date_param(request.query_params, "to")
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
+            # Filtered as a datetime range so the completed_at indexes can be used
+            if date_from:
+                tiers = [tasks.filter(completed_at__gte=start_of_day(date_from)) for tasks in tiers]
+            if date_to:
+                tiers = [tasks.filter(completed_at__lt=start_of_day(date_to + timedelta(days=1))) for tasks in tiers]
+            
+            merged = {}
+            for tasks in tiers:
+                for row in (
+                    tasks.values("assigned_to", "assigned_to__email", "owner_admin", "owner_admin__email")
+                    .annotate(
+                        completed=Count("id"),
+                        hours_count=Count("worked_hours"),
+                        total_hours=Sum("worked_hours"),
+                        on_time=Count("id", filter=Q(completed_at__date__lte=F("due_date"))),
+                        late=Count("id", filter=Q(completed_at__date__gt=F("due_date"))),
+                    )
+                    .order_by()
+                ):
+                    row["total_hours"] = row["total_hours"] or Decimal("0")
+                    key = (row["assigned_to"], row["owner_admin"])
+                    if key not in merged:
+                        merged[key] = row
+                        continue
+                    for name in ("completed", "hours_count", "total_hours", "on_time", "late"):
+                        merged[key][name] += row[name]
+            rows = sorted(merged.values(), key=lambda row: row["assigned_to"])
+            
+            users = []
+            admins = {}
+            totals = {"completed": 0, "on_time": 0, "late": 0, "hours_count": 0, "total_hours": Decimal("0")}
+            for row in rows:
+                users.append({
+                    "user_id": row["assigned_to"],
+                    "email": row["assigned_to__email"],
+                    "admin_id": row["owner_admin"],
+                    "completed": row["completed"],
+                    "on_time": row["on_time"],
+                    "late": row["late"],
+                    "total_hours": format_hours(row["total_hours"]),
+                    "average_hours": format_hours(row["total_hours"] / row["hours_count"]) if row["hours_count"] else None,
+                })
+                
+                # Admin figures are rolled up from the per user rows instead of a second query
+                admin = admins.setdefault(row["owner_admin"], {
+                    "admin_id": row["owner_admin"],
+                    "email": row["owner_admin__email"],
+                    "completed": 0, "on_time": 0, "late": 0, "hours_count": 0, "total_hours": Decimal("0"),
+                })
+                for summary in (admin, totals):
+                    summary["completed"] += row["completed"]
+                    summary["on_time"] += row["on_time"]
+                    summary["late"] += row["late"]
+                    summary["hours_count"] += row["hours_count"]
+                    summary["total_hours"] += row["total_hours"]
+            
+            response_context = {
+                "users": users,
+                "admins": [finish_summary(admin) for admin in admins.values()],
+                "totals": finish_summary(totals),
+            }
+            return Response({"message": "Task summary report retrieved successfully", "data": response_context}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    
+# Daily Completion Report API
+@extend_schema(
+    tags=["Task Management"],
+    parameters=[
+        OpenApiParameter("from", str, description=f"First day of the series (YYYY-MM-DD), defaults to {DAILY_REPORT_DEFAULT_DAYS} days before `to`"),
+        OpenApiParameter("to", str, description="Last day of the series (YYYY-MM-DD), defaults to today"),
+        OpenApiParameter("group_by", str, enum=["total", "admin", "user"], description="Return one series overall, per admin or per user"),
+    ]
+)
+class TaskDailyReportView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+    
+    GROUP_FIELDS = {
+        "total": (),
+        "admin": ("user__assigned_admin", "user__assigned_admin__email"),
+        "user": ("user", "user__email"),
+    }
+
+    def get(self, request, *args, **kwargs):
+        try:
             if request.user.is_superadmin():
-                task = Task.objects.get(id=task_id)
+                rollups = DailyCompletionRollup.objects.all()
             elif request.user.is_admin():
-                task = Task.objects.get(id=task_id, assigned_to__assigned_admin=request.user)
+                rollups = DailyCompletionRollup.objects.filter(user__assigned_admin_id=request.user.id)
             else:
                 return Response({"error": "You are not an admin"}, status=status.HTTP_403_FORBIDDEN)
             
-            if task.status != STATUS_COMPLETED:
-                return Response({"error": "Task is not completed"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                date_to = parse_date_param(request.query_params, "to") or timezone.localdate()
+                date_from = parse_date_param(request.query_params, "from") or date_to - timedelta(days=DAILY_REPORT_DEFAULT_DAYS - 1)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            serializer = self.get_serializer(task)
-            return Response({"message": "Task report retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
-        except Task.DoesNotExist:
-            return Response({"error": "No task found with this ID"}, status=status.HTTP_400_BAD_REQUEST)
+            if date_from > date_to:
+                return Response({"error": "from must not be after to"}, status=status.HTTP_400_BAD_REQUEST)
+            if (date_to - date_from).days >= DAILY_REPORT_MAX_DAYS:
+                return Response({"error": f"The range can span at most {DAILY_REPORT_MAX_DAYS} days"}, status=status.HTTP_400_BAD_REQUEST)
+            
+            group_by = request.query_params.get("group_by", "total")
+            if group_by not in self.GROUP_FIELDS:
+                return Response({"error": "group_by must be one of total, admin, user"}, status=status.HTTP_400_BAD_REQUEST)
+            group_fields = self.GROUP_FIELDS[group_by]
+            
+            rows = (
+                rollups.filter(day__gte=date_from, day__lte=date_to)
+                .values(*group_fields, "day")
+                .annotate(total_completed=Sum("completed"), total_hours=Sum("worked_hours"))
+                .order_by(*group_fields, "day")
+            )
+            
+            # Days without completions have no rollup row and are left out of the points
+            series = {}
+            for row in rows:
+                key = tuple(row[field] for field in group_fields)
+                if key not in series:
+                    if group_by == "admin":
+                        series[key] = {"admin_id": key[0], "email": key[1], "points": []}
+                    elif group_by == "user":
+                        series[key] = {"user_id": key[0], "email": key[1], "points": []}
+                    else:
+                        series[key] = {"points": []}
+                series[key]["points"].append({
+                    "date": row["day"],
+                    "completed": row["total_completed"],
+                    "worked_hours": format_hours(row["total_hours"]),
+                })
+            
+            response_context = {
+                "from": date_from,
+                "to": date_to,
+                "group_by": group_by,
+                "series": list(series.values()),
+            }
+            return Response({"message": "Daily completion report retrieved successfully", "data": response_context}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    
+# Task Search API
+@extend_schema(
+    tags=["Task Management"],
+    parameters=[
+        OpenApiParameter("q", str, description="Words to look for in the title, description and completion report"),
+        OpenApiParameter("page", int, description="Page number, starting at 1"),
+        OpenApiParameter("page_size", int, description=f"Results per page, at most {SEARCH_MAX_PAGE_SIZE}"),
+        OpenApiParameter("fields", str, description="Comma separated list of fields to return, e.g. id,title,status,assigned_to_id"),
+        OpenApiParameter("include", str, description="Pass users to return assigned users once in a top level users map"),
+    ]
+)
+class TaskSearchView(ReplicaReadAPIMixin, TaskFieldsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            tasks = Task.objects.select_related("assigned_to")
+            if request.user.is_admin():
+                tasks = tasks.filter(owner_admin_id=request.user.id)
+            elif not request.user.is_superadmin():
+                return Response({"error": "You are not an admin"}, status=status.HTTP_403_FORBIDDEN)
+            
+            query = request.query_params.get("q", "").strip()
+            if not query:
+                return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+            
+            try:
+                includes = self.get_includes()
+                values_serializer = self.get_values_serializer(includes)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            results = search_tasks(tasks, query)
+            if values_serializer:
+                results = results.values(*{"id", *values_serializer.fields})
+            
+            try:
+                page_size = int(request.query_params.get("page_size", SEARCH_PAGE_SIZE))
+                if page_size <= 0:
+                    raise ValueError
+                page = Paginator(results, min(page_size, SEARCH_MAX_PAGE_SIZE)).page(request.query_params.get("page", 1))
+            except ValueError:
+                return Response({"error": "page_size must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+            except InvalidPage as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            rows = list(page)
+            response_context = {
+                "message": "Tasks retrieved successfully",
+                "count": page.paginator.count,
+                "page": page.number,
+                "num_pages": page.paginator.num_pages,
+            }
+            # Search results span the admin's users, each is sent once instead of in every task
+            if "users" in includes:
+                response_context["users"] = sideload_users(rows)
+            body = splice_json(response_context, "data", self.render_tasks(rows, values_serializer))
+            return HttpResponse(body, content_type="application/json")
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    
+# Cache Metrics API
+@extend_schema(tags=["Metrics"])
+class CacheMetricsView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            if not request.user.is_superadmin():
+                return Response({"error": "You are not a superadmin"}, status=status.HTTP_403_FORBIDDEN)
+            
+            response_context = {
+                "task_list": task_list_cache.stats() if task_list_cache.enabled else None,
+                "task_fragments": task_fragment_cache.stats() if task_fragment_cache.enabled else None,
+            }
+            return Response({"message": "Cache metrics retrieved successfully", "data": response_context}, status=status.HTTP_200_OK)
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    
+# Password Hashing Metrics API
+@extend_schema(tags=["Metrics"])
+class PasswordHashMetricsView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            if not request.user.is_superadmin():
+                return Response({"error": "You are not a superadmin"}, status=status.HTTP_403_FORBIDDEN)
+            
+            # Per process, like the pool itself
+            return Response({"message": "Password hashing metrics retrieved successfully", "data": password_hash_pool.stats()}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apis.routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,6 +93,59 @@ DATABASES = {
     }
 }
 
+# DB_PROFILE=production runs SQLite in WAL mode so reads do not block behind
+# writers, with the pragmas below applied to every new connection. Connections
+# are kept for DB_CONN_MAX_AGE seconds and write transactions start with
+# BEGIN IMMEDIATE, so they queue on busy_timeout up front instead of failing
+# when a read lock cannot be upgraded. ASGI deployments set DB_CONN_MAX_AGE=0:
+# Django runs their sync code on threads that outlive the request, where
+# persistent connections are never closed.
+
+DB_PROFILE = os.getenv('DB_PROFILE', 'development').lower()
+
+SQLITE_PRODUCTION_SETTINGS = {
+    'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA busy_timeout=5000;'
+            'PRAGMA mmap_size=134217728;'
+            'PRAGMA cache_size=-20000;'
+        ),
+        'transaction_mode': 'IMMEDIATE',
+    },
+}
+
+if DB_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION_SETTINGS)
+
+# Read replicas: DB_REPLICAS is a comma separated list of SQLite files kept in
+# sync with the primary. Read only views (task lists and reports) query a
+# random replica; writes, and reads in a request after it wrote, use the
+# primary. A user who wrote, or whose task list changed, reads from the
+# primary for REPLICA_PIN_SECONDS so replication lag never shows them stale
+# data. The pins live on the REPLICA_PIN_CACHE_ALIAS cache, which has to be
+# shared between processes when there is more than one.
+
+DATABASE_REPLICAS = []
+
+for index, name in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_PROFILE == 'production':
+        DATABASES[alias].update(SQLITE_PRODUCTION_SETTINGS)
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['apis.routing.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+REPLICA_PIN_CACHE_ALIAS = 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -194,4 +248,68 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-}
\ No newline at end of file
+}
+
+# Cache of user is_active / role used by claim based JWT authentication (seconds)
+
+USER_STATUS_CACHE_TTL = 60
+USER_STATUS_CACHE_SIZE = 10000
+
+# Refresh token blacklist: Bloom filter rebuild interval and optional background pruning (seconds)
+
+TOKEN_BLACKLIST_FILTER_REFRESH = 30
+TOKEN_BLACKLIST_PRUNE_INTERVAL = None
+TOKEN_BLACKLIST_PRUNE_BATCH_SIZE = 1000
+
+# Async views (apis/async_views.py): synchronous Django code (ORM queries,
+# transactions) runs on a pool of ASYNC_SYNC_CONCURRENCY threads, and CPU
+# bound work runs on ASYNC_CPU_WORKERS threads (None for one per core)
+
+ASYNC_SYNC_CONCURRENCY = int(os.getenv('ASYNC_SYNC_CONCURRENCY', '16'))
+ASYNC_CPU_WORKERS = None
+
+# Password hashing: PASSWORD_HASH_POOL=true checks login passwords on a pool
+# of PASSWORD_HASH_WORKERS processes (None for one per core) instead of the
+# request thread. When PASSWORD_HASH_MAX_QUEUE hashes are already waiting for
+# a process, further logins fail fast with 503.
+
+PASSWORD_HASH_POOL = os.getenv('PASSWORD_HASH_POOL', 'false').lower() in ('true', '1')
+PASSWORD_HASH_WORKERS = None
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '32'))
+
+AUTHENTICATION_BACKENDS = ['apis.hashing.PooledModelBackend']
+
+# Caches. "tasks" holds rendered task lists and "task_fragments" rendered tasks,
+# the local memory backend evicts the least recently used entries past
+# MAX_ENTRIES and expires them after TIMEOUT. Local memory is per process, and
+# a write only invalidates the task lists cached by the process that made it,
+# so other processes serve stale lists until TASK_LIST_CACHE_TIMEOUT runs out.
+# Keep it short, or point "tasks" at a shared backend such as Redis when
+# running more than one process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'tasks': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tasks',
+        'TIMEOUT': int(os.getenv('TASK_LIST_CACHE_TIMEOUT', '5')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    'task_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'task_fragments',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+        },
+    },
+}
+
+# Cache aliases used for per-user task lists and per-task JSON fragments, None disables either cache
+
+TASK_LIST_CACHE_ALIAS = 'tasks'
+TASK_FRAGMENT_CACHE_ALIAS = 'task_fragments'